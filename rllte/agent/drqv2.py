@@ -27,6 +27,7 @@ from typing import Optional
 
 import gymnasium as gym
 import torch as th
+from torch import nn
 from torch.nn import functional as F
 
 from rllte.agent import utils
@@ -62,6 +63,7 @@ class DrQv2(OffPolicyAgent):
         update_every_steps (int): The agent update frequency.
         stddev_clip (float): The exploration std clip range.
         init_fn (str): Parameters initialization method.
+        mixed_precision (bool): Run the forward passes of the update in bfloat16 autocast (CUDA only).
 
     Returns:
         DrQv2 agent instance.
@@ -86,6 +88,7 @@ class DrQv2(OffPolicyAgent):
         update_every_steps: int = 2,
         stddev_clip: float = 0.3,
         init_fn: str = "orthogonal",
+        mixed_precision: bool = False,
     ) -> None:
         super().__init__(
             env=env,
@@ -103,6 +106,9 @@ class DrQv2(OffPolicyAgent):
         self.critic_target_tau = critic_target_tau
         self.update_every_steps = update_every_steps
         self.stddev_clip = stddev_clip
+        self.mixed_precision = mixed_precision and self.device.type == "cuda"
+        # image observations are fed to the cnn encoder in channels-last layout on cuda
+        self.channels_last = len(self.obs_shape) == 3 and self.device.type == "cuda"
 
         # default encoder
         if len(self.obs_shape) == 3:
@@ -124,7 +130,7 @@ class DrQv2(OffPolicyAgent):
             feature_dim=feature_dim,
             hidden_dim=hidden_dim,
             opt_class=th.optim.Adam,
-            opt_kwargs=dict(lr=lr, eps=eps),
+            opt_kwargs=utils.optimizer_kwargs(th.optim.Adam, lr=lr, eps=eps),
             init_fn=init_fn,
         )
 
@@ -144,6 +150,18 @@ class DrQv2(OffPolicyAgent):
         # set all the modules [essential operation!!!]
         self.set(encoder=encoder, policy=policy, storage=storage, distribution=dist, augmentation=aug)
 
+    def freeze(self, **kwargs) -> None:
+        """Freeze the agent and get ready for training. With `th_compile`, the networks used by the
+            update are compiled in place, so that their parameters and state dicts are left untouched.
+        """
+        compile_in_place = kwargs.get("th_compile", False) and hasattr(nn.Module, "compile")
+        super().freeze(**{**kwargs, "th_compile": False} if compile_in_place else kwargs)
+        if self.channels_last:
+            self.policy.encoder.to(memory_format=th.channels_last)
+        if compile_in_place:
+            for module in (self.policy.encoder, self.policy.actor, self.policy.critic, self.policy.critic_target):
+                module.compile()
+
     def update(self) -> None:
         """Update the agent and return training metrics such as actor loss, critic_loss, etc."""
         if self.global_step % self.update_every_steps != 0:
@@ -152,18 +170,23 @@ class DrQv2(OffPolicyAgent):
         # sample a batch
         batch = self.storage.sample()
 
-        # obs augmentation
+        # obs augmentation, in a single pass over both halves (the shifts are sampled per sample)
         if self.aug is not None:
-            obs = self.aug(batch.observations)
-            next_obs = self.aug(batch.next_observations)
+            obs, next_obs = self.aug(th.cat([batch.observations, batch.next_observations], dim=0)).chunk(2, dim=0)
         else:
             obs = batch.observations
             next_obs = batch.next_observations
 
+        # `grid_sample` returns contiguous tensors, so the layout is converted after the augmentation
+        if self.channels_last:
+            obs = obs.contiguous(memory_format=th.channels_last)
+            next_obs = next_obs.contiguous(memory_format=th.channels_last)
+
         # encode
-        encoded_obs = self.policy.encoder(obs)
-        with th.no_grad():
-            encoded_next_obs = self.policy.encoder(next_obs)
+        with self.autocast():
+            encoded_obs = self.policy.encoder(obs)
+            with th.no_grad():
+                encoded_next_obs = self.policy.encoder(next_obs)
 
         # update criitc
         self.update_critic(encoded_obs, batch.actions, batch.rewards, batch.discounts, encoded_next_obs)
@@ -174,6 +197,14 @@ class DrQv2(OffPolicyAgent):
         # udpate critic target
         utils.soft_update_params(self.policy.critic, self.policy.critic_target, self.critic_target_tau)
 
+    def autocast(self) -> th.autocast:
+        """Get the autocast context of the update, which is a no-op unless `mixed_precision` is on.
+
+        Returns:
+            Autocast context manager.
+        """
+        return th.autocast(device_type=self.device.type, dtype=th.bfloat16, enabled=self.mixed_precision)
+
     def update_critic(
         self,
         obs: th.Tensor,
@@ -194,19 +225,19 @@ class DrQv2(OffPolicyAgent):
         Returns:
             None.
         """
-
-        with th.no_grad():
-            # sample actions
-            dist = self.policy.get_dist(next_obs)
-            next_actions = dist.sample(clip=self.stddev_clip)
-            next_obs_actions = th.concat([next_obs, next_actions], dim=-1)
-            target_Q1, target_Q2 = self.policy.critic_target(next_obs_actions)
-            target_V = th.min(target_Q1, target_Q2)
-            target_Q = rewards + (discount * target_V)
-
-        obs_actions = th.concat([obs, actions], dim=-1)
-        Q1, Q2 = self.policy.critic(obs_actions)
-        critic_loss = F.mse_loss(Q1, target_Q) + F.mse_loss(Q2, target_Q)
+        with self.autocast():
+            with th.no_grad():
+                # sample actions
+                dist = self.policy.get_dist(next_obs)
+                next_actions = dist.sample(clip=self.stddev_clip)
+                next_obs_actions = th.concat([next_obs, next_actions], dim=-1)
+                target_Q1, target_Q2 = self.policy.critic_target(next_obs_actions)
+                target_V = th.min(target_Q1, target_Q2)
+                target_Q = rewards + (discount * target_V)
+
+            obs_actions = th.concat([obs, actions], dim=-1)
+            Q1, Q2 = self.policy.critic(obs_actions)
+            critic_loss = F.mse_loss(Q1, target_Q) + F.mse_loss(Q2, target_Q)
 
         # optimize encoder and critic
         self.policy.optimizers["encoder_opt"].zero_grad(set_to_none=True)
@@ -230,14 +261,15 @@ class DrQv2(OffPolicyAgent):
         Returns:
             None.
         """
-        # sample actions
-        dist = self.policy.get_dist(obs)
-        actions = dist.sample(clip=self.stddev_clip)
-        obs_actions = th.concat([obs, actions], dim=-1)
-        Q1, Q2 = self.policy.critic(obs_actions)
-        Q = th.min(Q1, Q2)
-
-        actor_loss = -Q.mean()
+        with self.autocast():
+            # sample actions
+            dist = self.policy.get_dist(obs)
+            actions = dist.sample(clip=self.stddev_clip)
+            obs_actions = th.concat([obs, actions], dim=-1)
+            Q1, Q2 = self.policy.critic(obs_actions)
+            Q = th.min(Q1, Q2)
+
+            actor_loss = -Q.mean().float()
 
         # optimize actor
         self.policy.optimizers["actor_opt"].zero_grad(set_to_none=True)
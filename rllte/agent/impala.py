@@ -30,6 +30,7 @@ import torch as th
 from torch import nn
 from torch.nn import functional as F
 
+from rllte.agent import utils
 from rllte.common.prototype import DistributedAgent
 from rllte.common.type_alias import VecEnv
 from rllte.xploit.encoder import IdentityEncoder, MnihCnnEncoder
@@ -126,8 +127,11 @@ class IMPALA(DistributedAgent):
         num_actors (int): Number of actors.
         num_learners (int): Number of learners.
         num_storages (int): Number of storages.
+        envs_per_actor (int): Number of environments stepped as a batch by each actor.
         feature_dim (int): Number of features extracted by the encoder.
         batch_size (int): Number of samples per batch to load.
+        max_batch_size (Optional[int]): Maximum number of storages per batch. Storages that are already full
+            beyond `batch_size` are drained into the same batch up to this limit. Defaults to `batch_size`.
         lr (float): The learning rate.
         eps (float): Term added to the denominator to improve numerical stability.
         hidden_dim (int): The size of the hidden layers.
@@ -153,8 +157,10 @@ class IMPALA(DistributedAgent):
         num_actors: int = 45,
         num_learners: int = 4,
         num_storages: int = 60,
+        envs_per_actor: int = 1,
         feature_dim: int = 512,
         batch_size: int = 4,
+        max_batch_size: Optional[int] = None,
         lr: float = 4e-4,
         eps: float = 0.01,
         hidden_dim: int = 512,
@@ -175,6 +181,7 @@ class IMPALA(DistributedAgent):
             num_actors=num_actors,
             num_learners=num_learners,
             num_storages=num_storages,
+            envs_per_actor=envs_per_actor,
             batch_size=batch_size,
             feature_dim=feature_dim,
             use_lstm=use_lstm,
@@ -212,7 +219,7 @@ class IMPALA(DistributedAgent):
             feature_dim=feature_dim,
             hidden_dim=hidden_dim,
             opt_class=th.optim.RMSprop,
-            opt_kwargs=dict(lr=lr, eps=eps),
+            opt_kwargs=utils.optimizer_kwargs(th.optim.RMSprop, lr=lr, eps=eps),
             init_fn=init_fn,
             use_lstm=use_lstm,
         )
@@ -224,7 +231,9 @@ class IMPALA(DistributedAgent):
             device=device,
             storage_size=self.num_steps,
             num_storages=num_storages,
+            num_envs=envs_per_actor,
             batch_size=batch_size,
+            max_batch_size=max_batch_size,
         )
 
         # set all the modules [essential operation!!!]
@@ -23,13 +23,30 @@
 # =============================================================================
 
 
-from typing import Tuple
+import inspect
+from typing import Any, Dict, Tuple, Type
 
 import numpy as np
 import torch as th
 from torch import nn
 
 
+def optimizer_kwargs(opt_class: Type[th.optim.Optimizer], **kwargs) -> Dict[str, Any]:
+    """Build the keyword arguments of an optimizer, using the multi-tensor (foreach) implementation when available.
+
+    Args:
+        opt_class (Type[th.optim.Optimizer]): Optimizer class.
+        **kwargs: Arguments of the optimizer.
+
+    Returns:
+        Keyword arguments of the optimizer.
+    """
+    # `foreach` is only accepted by the optimizers of torch>=1.12
+    if "foreach" in inspect.signature(opt_class.__init__).parameters:
+        kwargs.setdefault("foreach", True)
+    return kwargs
+
+
 def soft_update_params(net: nn.Module, target_net: nn.Module, tau: float) -> None:
     """Soft update of the target network.
 
@@ -41,8 +58,12 @@ def soft_update_params(net: nn.Module, target_net: nn.Module, tau: float) -> Non
     Returns:
         None
     """
-    for param, target_param in zip(net.parameters(), target_net.parameters()):
-        target_param.data.copy_(tau * param.data + (1 - tau) * target_param.data)
+    with th.no_grad():
+        params = list(net.parameters())
+        target_params = list(target_net.parameters())
+        # target = (1 - tau) * target + tau * param, over all the parameters at once
+        th._foreach_mul_(target_params, 1.0 - tau)
+        th._foreach_add_(target_params, params, alpha=tau)
 
 
 def to_torch(xs: Tuple[np.ndarray, ...], device: th.device) -> Tuple[th.Tensor, ...]:
@@ -129,7 +129,7 @@ class BaseAgent(ABC):
         # set seed
         self.seed = seed
         th.manual_seed(seed=seed)
-        if th.cuda.is_available():
+        if self.device.type == "cuda" and th.cuda.is_available():
             th.cuda.manual_seed_all(seed)
         np.random.seed(seed)
         random.seed(seed)
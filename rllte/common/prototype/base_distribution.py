@@ -23,7 +23,7 @@
 # =============================================================================
 
 
-from typing import Any
+from typing import Any, Dict, Tuple
 import torch as th
 from torch.distributions import Distribution
 
@@ -35,6 +35,26 @@ class BaseDistribution(Distribution):
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(validate_args=False)
+        # buffers of the standard normal noises keyed by (shape, dtype, device), reused across the
+        # sampling steps, e.g., acting on (num_envs, A) and updating on (batch_size, A) actions
+        self._noise_bufs: Dict[Tuple[th.Size, th.dtype, th.device], th.Tensor] = {}
+
+    def _standard_normal_like(self, x: th.Tensor) -> th.Tensor:
+        """Draw standard normal noises shaped like `x` into a buffer reused for each shape, dtype
+            and device of `x`. The returned tensor is overwritten by the next call with the same
+            kind of `x`, so it must not be kept around.
+
+        Args:
+            x (th.Tensor): Reference tensor.
+
+        Returns:
+            Standard normal noises.
+        """
+        key = (x.shape, x.dtype, x.device)
+        buf = self._noise_bufs.get(key)
+        if buf is None:
+            buf = self._noise_bufs[key] = th.empty(x.shape, dtype=x.dtype, device=x.device)
+        return buf.normal_()
 
     def __call__(self, *args, **kwargs) -> Any:
         """Call the distribution."""
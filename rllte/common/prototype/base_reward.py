@@ -32,7 +32,7 @@ import numpy as np
 import torch as th
 
 from rllte.common.preprocessing import process_action_space, process_observation_space
-from rllte.common.utils import TorchRunningMeanStd, RewardForwardFilter
+from rllte.common.utils import TorchRunningMeanStd, RewardForwardFilter, standardize
 
 
 class BaseReward(ABC):
@@ -80,6 +80,11 @@ class BaseReward(ABC):
         self.kappa = kappa
         self.rwd_norm_type = rwd_norm_type
         self.obs_norm_type = obs_norm_type
+        # fixed properties of the inputs, checked once instead of on every `normalize` call
+        self._obs_is_image = len(self.obs_shape) > 2
+        self._device_is_cuda = self.device.type == "cuda"
+        # batches of images are handed to the cnn encoders in channels-last layout on cuda, see `normalize`
+        self.channels_last = len(self.obs_shape) == 3 and self._device_is_cuda
         # build the running mean and std for normalization
         self.rwd_norm = TorchRunningMeanStd() if self.rwd_norm_type == "rms" else None
         self.obs_norm = (
@@ -91,19 +96,22 @@ class BaseReward(ABC):
         if self.obs_norm_type == "rms":
             self.envs = envs
             self.init_normalization()
+            self.obs_norm.sync_to(self.device)
         # build the reward forward filter
         self.rff = RewardForwardFilter(gamma) if gamma is not None else None
         # training tracker
         self.global_step = 0
+        # weighting coefficient at the current step, decayed once per `compute` call
+        self._weight = beta
         self.metrics = {"loss": [], "intrinsic_rewards": []}
 
     @property
     def weight(self) -> float:
         """Get the weighting coefficient of the intrinsic rewards."""
-        return self.beta * np.power(1.0 - self.kappa, self.global_step)
+        return self._weight
 
     def scale(self, rewards: th.Tensor) -> th.Tensor:
-        """Scale the intrinsic rewards.
+        """Scale the intrinsic rewards in place.
 
         Args:
             rewards (th.Tensor): The intrinsic rewards with shape (n_steps, n_envs).
@@ -117,26 +125,35 @@ class BaseReward(ABC):
                 rewards[step] = self.rff.update(rewards[step])
         # scale the intrinsic rewards
         if self.rwd_norm_type == "rms":
-            self.rwd_norm.update(rewards.ravel())
-            return (rewards / self.rwd_norm.std) * self.weight
+            self.rwd_norm.update(rewards)
+            # fold the weight into the (0-dim) normalizer, so that the rewards are touched once
+            return rewards.mul_(self.weight / self.rwd_norm.std)
         elif self.rwd_norm_type == "minmax":
-            return (
-                (rewards - rewards.min())
-                / (rewards.max() - rewards.min())
-                * self.weight
-            )
+            rwd_min, rwd_max = rewards.min(), rewards.max()
+            return rewards.sub_(rwd_min).mul_(self.weight / (rwd_max - rwd_min))
         else:
-            return rewards * self.weight
+            return rewards.mul_(self.weight)
 
     def normalize(self, x: th.Tensor) -> th.Tensor:
         """Normalize the observations data, especially useful for images-based observations."""
+        # the input is never modified, as it may be the caller's samples
+        # (n_steps, n_envs, C, H, W) batches of `compute` are laid out as (n_steps, n_envs, H, W, C) in memory,
+        # so that the per-env slices and the flattened batches fed to the cnn encoders are channels-last
+        channels_last = self.channels_last and x.dim() == 5
+        if channels_last:
+            # reorder in the input dtype, where the copy is cheapest for uint8 images
+            x = x.permute(0, 1, 3, 4, 2).contiguous()
         if self.obs_norm:
-            x = (
-                ((x - self.obs_norm.mean.to(self.device)))
-                / th.sqrt(self.obs_norm.var.to(self.device))
-            ).clip(-5, 5)
+            x = x if x.is_floating_point() else x.float()
+            inv_std, bias = self.obs_norm.inv_std_dev, self.obs_norm.bias_dev
+            if channels_last:
+                inv_std, bias = inv_std.permute(1, 2, 0), bias.permute(1, 2, 0)
+            # (x - mean) / std computed as x * inv_std + bias
+            x = standardize(x, inv_std, bias, 5.0)
         else:
-            x = x / 255.0 if len(self.obs_shape) > 2 else x
+            x = x / 255.0 if self._obs_is_image else x
+        if channels_last:
+            x = x.permute(0, 1, 4, 2, 3)
         return x
 
     def init_normalization(self) -> None:
@@ -231,11 +248,10 @@ class BaseReward(ABC):
         
         # update the obs RMS if necessary
         if self.obs_norm_type == "rms" and sync:
-            self.obs_norm.update(
-                samples["observations"].reshape(-1, *self.obs_shape).cpu()
-            )
-        # update the global step
+            self.obs_norm.update(samples["observations"])
+        # update the global step and decay the weighting coefficient accordingly
         self.global_step += 1
+        self._weight *= 1.0 - self.kappa
 
     @abstractmethod
     def update(self, samples: Dict[str, th.Tensor]) -> None:
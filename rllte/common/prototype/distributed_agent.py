@@ -27,15 +27,16 @@ import os
 import threading
 import time
 import traceback
-from collections import deque
-from typing import Any, Callable, Deque, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import numpy as np
 import torch as th
+from gymnasium.vector import SyncVectorEnv
 from torch import multiprocessing as mp
 
 from rllte.common.prototype.base_agent import BaseAgent
 from rllte.common.type_alias import DistributedPolicyType, DistributedStorageType, VecEnv
+from rllte.common.utils import StorageSlots
 from rllte.env.utils import DistributedWrapper
 
 
@@ -53,6 +54,7 @@ class DistributedAgent(BaseAgent):  # type: ignore
         num_actors (int): Number of actors.
         num_learners (int): Number of learners.
         num_storages (int): Number of storages.
+        envs_per_actor (int): Number of environments stepped as a batch by each actor.
         **kwargs: Arbitrary arguments such as `batch_size` and `hidden_dim`.
 
     Returns:
@@ -70,6 +72,7 @@ class DistributedAgent(BaseAgent):  # type: ignore
         num_actors: int = 45,
         num_learners: int = 4,
         num_storages: int = 60,
+        envs_per_actor: int = 1,
         **kwargs,
     ) -> None:
         super().__init__(env=env, eval_env=eval_env, tag=tag, seed=seed, device=device, pretraining=False)
@@ -78,17 +81,21 @@ class DistributedAgent(BaseAgent):  # type: ignore
         self.num_learners = num_learners
         self.num_steps = num_steps
         self.num_storages = num_storages
+        self.envs_per_actor = envs_per_actor
 
         # get separate environments
         try:
             self.env = self.env.envs  # type: ignore
         except AttributeError:
             raise AttributeError("Asynchronous execution is unavailable for distributed training!")  # noqa: B904
+        assert len(self.env) >= self.num_actors * self.envs_per_actor, (
+            f"{self.num_actors} actors with {self.envs_per_actor} environments each "
+            f"need at least {self.num_actors * self.envs_per_actor} environments, got {len(self.env)}!"
+        )
 
         # create process and thread pool
         self.ctx = mp.get_context("fork")
-        self.free_queue = self.ctx.SimpleQueue()
-        self.full_queue = self.ctx.SimpleQueue()
+        self.slots = StorageSlots(self.ctx, self.num_storages)
         self.actor_pool: List = list()
         self.learner_threads: List[threading.Thread] = list()
 
@@ -110,6 +117,19 @@ class DistributedAgent(BaseAgent):  # type: ignore
         self.policy: DistributedPolicyType
         self.storage: DistributedStorageType
 
+    @staticmethod
+    def make_actor_env(envs: List) -> DistributedWrapper:
+        """Gather the sub-environments of an actor into a vectorized env that is stepped at once.
+            The observations are written into a persistent array instead of being copied at each step.
+
+        Args:
+            envs (List): Sub-environments driven by the actor.
+
+        Returns:
+            Environments wrapped by `DistributedWrapper`.
+        """
+        return DistributedWrapper(SyncVectorEnv([lambda env=env: env for env in envs], copy=False))
+
     def run(self, env: DistributedWrapper, actor_idx: int) -> None:
         """Sample function of each actor. Implemented by individual algorithms.
 
@@ -125,10 +145,11 @@ class DistributedAgent(BaseAgent):  # type: ignore
             seed = actor_idx * int.from_bytes(os.urandom(4), byteorder="little")
             env_output = env.reset(seed)
             # get initial actor output
-            actor_output = self.policy.actor(env_output, training=True)
+            with th.inference_mode():
+                actor_output = self.policy.actor(env_output, training=True)
 
             while True:
-                idx = self.free_queue.get()
+                idx = self.slots.get_free()
                 if idx is None:
                     break
 
@@ -136,13 +157,13 @@ class DistributedAgent(BaseAgent):  # type: ignore
                 self.storage.add(idx, 0, actor_output, env_output)
                 # do new rollout.
                 for t in range(self.num_steps):
-                    with th.no_grad():
+                    with th.inference_mode():
                         actor_output = self.policy.actor(env_output, training=True)
                     env_output = env.step(actor_output["actions"])
 
                     self.storage.add(idx, t + 1, actor_output, env_output)
 
-                self.full_queue.put(idx)
+                self.slots.put_full(idx)
 
         # return silently.
         except KeyboardInterrupt:
@@ -189,39 +210,46 @@ class DistributedAgent(BaseAgent):  # type: ignore
         # training tracker
         global_step = 0
         global_episode = 0
+        # each learner only writes its own counters, so no lock is needed
+        learner_steps = [0] * self.num_learners
+        learner_episodes = [0] * self.num_learners
         metrics = dict()
-        episode_rewards: Deque = deque(maxlen=10)
-        episode_steps: Deque = deque(maxlen=10)
+        # ring buffers of the last ten episodes
+        episode_rewards = np.zeros(10, dtype=np.float32)
+        episode_steps = np.zeros(10, dtype=np.float32)
+        num_episodes = 0
 
-        def sample_and_update(lock=threading.Lock()):  # B008
+        def sample_and_update(learner_idx: int) -> None:
             """Thread target for the learning process."""
-            nonlocal global_step, global_episode, metrics
-            while global_step < num_train_steps:
+            nonlocal metrics
+            # bind the loop invariants to locals
+            storage, slots, update, num_steps = self.storage, self.slots, self.update, self.num_steps
+            while sum(learner_steps) < num_train_steps:
                 # sample batch
-                batch = self.storage.sample(free_queue=self.free_queue, full_queue=self.full_queue)
+                batch = storage.sample(slots=slots)
+                if batch is None:
+                    break
                 # update agent
-                metrics = self.update(batch)
-                with lock:
-                    global_step += self.num_steps * self.storage.batch_size
-                    global_episode += self.storage.batch_size
+                metrics = update(batch)
+                # the batch may hold more than `batch_size` rollouts if extra storages were drained
+                num_rollouts = batch["rewards"].shape[1]
+                learner_steps[learner_idx] += num_steps * num_rollouts
+                learner_episodes[learner_idx] += num_rollouts
 
         # start actor processes
         for actor_idx in range(self.num_actors):
+            actor_envs = self.env[actor_idx * self.envs_per_actor : (actor_idx + 1) * self.envs_per_actor]
             actor = self.ctx.Process(  # type: ignore
                 target=self.run,
-                kwargs={"env": DistributedWrapper(self.env[actor_idx]), "actor_idx": actor_idx},  # type: ignore
+                kwargs={"env": self.make_actor_env(actor_envs), "actor_idx": actor_idx},  # type: ignore
             )
             actor.start()
             self.actor_pool.append(actor)  # type: ignore
         self.logger.info(f"{self.num_actors} actors started!")
 
-        # serialize the data
-        for _ in range(self.num_storages):
-            self.free_queue.put(_)
-
         # start learner threads
         for i in range(self.num_learners):
-            thread = threading.Thread(target=sample_and_update, name=f"sample-and-update-{i}")
+            thread = threading.Thread(target=sample_and_update, args=(i,), name=f"sample-and-update-{i}")
             thread.start()
             self.learner_threads.append(thread)
         self.logger.info(f"{self.num_learners} learners started!")
@@ -232,19 +260,25 @@ class DistributedAgent(BaseAgent):  # type: ignore
             while global_step < num_train_steps:
                 start_step = global_step
                 time.sleep(5)
+                global_step, global_episode = sum(learner_steps), sum(learner_episodes)
 
                 if metrics.get("episode_returns"):
-                    episode_rewards.extend(metrics["episode_returns"])
-                    episode_steps.extend(metrics["episode_steps"])
-
-                if len(episode_rewards) > 0:
+                    new_rewards = np.asarray(metrics["episode_returns"])[-10:]
+                    new_steps = np.asarray(metrics["episode_steps"])[-10:]
+                    ring_idx = (num_episodes + np.arange(len(new_rewards))) % 10
+                    episode_rewards[ring_idx] = new_rewards
+                    episode_steps[ring_idx] = new_steps
+                    num_episodes += len(new_rewards)
+
+                if num_episodes > 0:
+                    num_recent = min(num_episodes, 10)
                     episode_time, total_time = self.timer.reset()
 
                     train_metrics = {
                         "step": global_step,
                         "episode": global_episode,
-                        "episode_length": np.mean(list(episode_steps)),
-                        "episode_reward": np.mean(list(episode_rewards)),
+                        "episode_length": np.mean(episode_steps[:num_recent]),
+                        "episode_reward": np.mean(episode_rewards[:num_recent]),
                         "fps": (global_step - start_step) / episode_time,
                         "total_time": total_time,
                     }
@@ -279,8 +313,7 @@ class DistributedAgent(BaseAgent):  # type: ignore
             self.logger.info("Training Accomplished!")
             self.logger.info(f"Model saved at: {self.work_dir / 'model'}")
         finally:
-            for _ in range(self.num_actors):
-                self.free_queue.put(None)
+            self.slots.stop()
             for actor in self.actor_pool:
                 actor.join(timeout=1)
 
@@ -294,14 +327,14 @@ class DistributedAgent(BaseAgent):  # type: ignore
             The evaluation results.
         """
         assert self.eval_env is not None, "Please set `eval_env` for evaluation!"
-        env = DistributedWrapper(self.eval_env.envs[0])
+        env = self.make_actor_env([self.eval_env.envs[0]])  # type: ignore
         seed = self.num_actors * int.from_bytes(os.urandom(4), byteorder="little")
         env_output = env.reset(seed)
 
         episode_rewards: List[float] = []
         episode_steps = []
         while len(episode_rewards) < num_eval_episodes:
-            with th.no_grad():
+            with th.inference_mode():
                 actor_output = self.policy.actor(env_output, training=False)
             env_output = env.step(actor_output["actions"])
             if env_output["terminateds"].item() or env_output["truncateds"].item():
@@ -26,7 +26,7 @@
 import json
 import os
 import re
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import torch as th
@@ -46,18 +46,28 @@ class RewardForwardFilter:
         return self.rewems
 
 class TorchRunningMeanStd:
-    """Running mean and std for torch tensor."""
+    """Running mean and std for torch tensor. The statistics follow the device of the incoming data,
+        so that they are tracked without host-device copies.
+    """
 
     def __init__(self, epsilon=1e-4, shape=(), device=None) -> None:
         self.mean = th.zeros(shape, device=device)
         self.var = th.ones(shape, device=device)
         self.count = epsilon
+        # cached mean and inverse std on a consumer device, see `sync_to`
+        self._sync_device: Optional[th.device] = None
+        self.mean_dev: Optional[th.Tensor] = None
+        self.inv_std_dev: Optional[th.Tensor] = None
+        self.bias_dev: Optional[th.Tensor] = None
 
     def update(self, x) -> None:
-        """Update mean and std with batch data."""
+        """Update mean and std with batch data, whose leading dimensions are all treated as batch dimensions."""
         with th.no_grad():
+            if self.mean.device != x.device:
+                self.mean, self.var = self.mean.to(x.device), self.var.to(x.device)
+            x = x.reshape(-1, *self.mean.shape)
             batch_mean = th.mean(x, dim=0)
-            batch_var = th.var(x, dim=0)
+            batch_var = th.var(x, dim=0, unbiased=False)
             batch_count = x.shape[0]
             self.update_from_moments(batch_mean, batch_var, batch_count)
 
@@ -66,6 +76,24 @@ class TorchRunningMeanStd:
         self.mean, self.var, self.count = self.update_mean_var_count_from_moments(
             self.mean, self.var, self.count, batch_mean, batch_var, batch_count
         )
+        if self._sync_device is not None:
+            self.sync_to(self._sync_device)
+
+    def sync_to(self, device: th.device, eps: float = 1e-8) -> None:
+        """Cache the mean, the inverse std and the standardization bias `-mean / std` on `device`,
+            and keep the cache fresh on every update.
+
+        Args:
+            device (th.device): Device of the consumer of the statistics.
+            eps (float): Small constant that keeps the inverse std finite for constant features.
+
+        Returns:
+            None.
+        """
+        self._sync_device = th.device(device)
+        self.mean_dev = self.mean.to(self._sync_device)
+        self.inv_std_dev = th.rsqrt(self.var.to(self._sync_device) + eps)
+        self.bias_dev = -self.mean_dev * self.inv_std_dev
 
     @property
     def std(self) -> th.Tensor:
@@ -87,6 +115,23 @@ class TorchRunningMeanStd:
         return new_mean, new_var, new_count
 
 
+@th.jit.script
+def standardize(x: th.Tensor, inv_std: th.Tensor, bias: th.Tensor, clip: float) -> th.Tensor:
+    """Standardize data as `x * inv_std + bias` and clip it, compiled by TorchScript so that
+        the fuser can emit a single elementwise kernel on GPU.
+
+    Args:
+        x (th.Tensor): Data to standardize.
+        inv_std (th.Tensor): Inverse standard deviation.
+        bias (th.Tensor): Standardization bias `-mean * inv_std`.
+        clip (float): Bound of the standardized data.
+
+    Returns:
+        Standardized data.
+    """
+    return th.clamp(th.addcmul(bias, x, inv_std), -clip, clip)
+
+
 class ExportModel(nn.Module):
     """Module for model export.
 
@@ -141,6 +186,121 @@ class eval_mode:
         return False
 
 
+class StorageSlots:
+    """Shared states of the storage slots for the communication between actors and learners.
+        Actors claim free slots and mark them full after a rollout, learners claim full slots
+        (oldest first) and release them after sampling.
+
+    Args:
+        ctx (Any): Multiprocessing context used to create the shared objects.
+        num_slots (int): The number of storage slots.
+
+    Returns:
+        Storage slots instance.
+    """
+
+    FREE, FULL, IN_USE = 0, 1, 2
+
+    def __init__(self, ctx: Any, num_slots: int) -> None:
+        self.num_slots = num_slots
+        # all the slots are free at the beginning
+        self.states = ctx.Array("b", num_slots, lock=False)
+        # the order in which the slots were filled
+        self.stamps = ctx.Array("q", num_slots, lock=False)
+        self.counter = ctx.Value("q", 0, lock=False)
+        self.cond = ctx.Condition()
+        self.stop_event = ctx.Event()
+
+    def _claim(self, state: int, timeout: float, block: bool = True) -> Optional[int]:
+        """Claim a slot in the given state and mark it in use.
+
+        Args:
+            state (int): The state of the slot to claim.
+            timeout (float): The interval for checking the stop signal while waiting.
+            block (bool): Wait until a slot is available or return immediately.
+
+        Returns:
+            The index of the slot, or `None` if stopped (or none is available when not blocking).
+        """
+        states, stamps = self.states, self.stamps
+        with self.cond:
+            while not self.stop_event.is_set():
+                candidates = [i for i in range(self.num_slots) if states[i] == state]
+                if candidates:
+                    idx = min(candidates, key=stamps.__getitem__) if state == self.FULL else candidates[0]
+                    states[idx] = self.IN_USE
+                    return idx
+                if not block:
+                    break
+                self.cond.wait(timeout)
+        return None
+
+    def get_free(self, timeout: float = 1.0) -> Optional[int]:
+        """Claim a free slot for writing a rollout.
+
+        Args:
+            timeout (float): The interval for checking the stop signal while waiting.
+
+        Returns:
+            The index of the slot, or `None` if stopped.
+        """
+        return self._claim(self.FREE, timeout)
+
+    def get_full(self, timeout: float = 1.0) -> Optional[int]:
+        """Claim the oldest full slot for sampling.
+
+        Args:
+            timeout (float): The interval for checking the stop signal while waiting.
+
+        Returns:
+            The index of the slot, or `None` if stopped.
+        """
+        return self._claim(self.FULL, timeout)
+
+    def try_get_full(self) -> Optional[int]:
+        """Claim the oldest full slot without waiting.
+
+        Returns:
+            The index of the slot, or `None` if no slot is full.
+        """
+        return self._claim(self.FULL, timeout=0.0, block=False)
+
+    def put_full(self, idx: int) -> None:
+        """Mark a slot as full after writing a rollout.
+
+        Args:
+            idx (int): The index of the slot.
+
+        Returns:
+            None.
+        """
+        with self.cond:
+            self.stamps[idx] = self.counter.value
+            self.counter.value += 1
+            self.states[idx] = self.FULL
+            self.cond.notify_all()
+
+    def put_free(self, indices: List[int]) -> None:
+        """Release slots after sampling.
+
+        Args:
+            indices (List[int]): The indices of the slots.
+
+        Returns:
+            None.
+        """
+        with self.cond:
+            for idx in indices:
+                self.states[idx] = self.FREE
+            self.cond.notify_all()
+
+    def stop(self) -> None:
+        """Wake up all the waiting actors and learners and make them return `None`."""
+        self.stop_event.set()
+        with self.cond:
+            self.cond.notify_all()
+
+
 def to_numpy(xs: Tuple[th.Tensor, ...]) -> Tuple[np.ndarray, ...]:
     """Converts torch tensors to numpy arrays.
 
@@ -225,52 +225,70 @@ class FrameStack(gym.Wrapper):
 
 
 class DistributedWrapper:
-    """An env wrapper to adapt to the distributed trainer.
+    """An env wrapper to adapt to the distributed trainer. The wrapped vectorized env is stepped as a whole,
+        and the step outputs are written into pre-allocated tensors of shape (1, num_envs, ...).
 
     Args:
-        env (gym.Env): A Gym-like env.
+        env (VectorEnv): A vectorized env, e.g., a `SyncVectorEnv` over the sub-environments of an actor.
 
     Returns:
         Processed env.
     """
 
-    def __init__(self, env: gym.Env) -> None:
+    def __init__(self, env: VectorEnv) -> None:
         self.env = env
-        self.episode_return = None
-        self.episode_step = None
-        if env.action_space.__class__.__name__ == "Discrete":
+        self.num_envs = env.num_envs
+        action_space = env.single_action_space
+        if action_space.__class__.__name__ == "Discrete":
             self.action_type = "Discrete"
             self.action_dim = 1
-        elif env.action_space.__class__.__name__ == "Box":
+            self.action_dtype = th.int64
+        elif action_space.__class__.__name__ == "Box":
             self.action_type = "Box"
-            self.action_dim = env.action_space.shape[0]
+            self.action_dim = action_space.shape[0]
+            self.action_dtype = th.float32
         else:
             raise NotImplementedError("Unsupported action type!")
 
+        # pre-allocated buffers, which are refilled in place at each step
+        self.episode_return = th.zeros(1, self.num_envs)
+        self.episode_step = th.zeros(1, self.num_envs, dtype=th.int32)
+        self._reward_buf = th.zeros(1, self.num_envs)
+        self._terminated_buf = th.zeros(1, self.num_envs, dtype=th.uint8)
+        self._truncated_buf = th.zeros(1, self.num_envs, dtype=th.uint8)
+        self._episode_return_buf = th.zeros(1, self.num_envs)
+        self._episode_step_buf = th.zeros(1, self.num_envs, dtype=th.int32)
+        # torch view of the observation array returned by the env
+        self._obs_array: Optional[np.ndarray] = None
+        self._obs_buf: th.Tensor
+
     def reset(self, seed) -> Dict[str, th.Tensor]:
         """Reset the environment."""
-        init_reward = th.zeros(1, 1)
-        init_last_action = th.zeros(1, self.action_dim, dtype=th.int64)
-        self.episode_return = th.zeros(1, 1)
-        self.episode_step = th.zeros(1, 1, dtype=th.int32)
-        init_terminated = th.ones(1, 1, dtype=th.uint8)
-        init_truncated = th.ones(1, 1, dtype=th.uint8)
+        self.episode_return.zero_()
+        self.episode_step.zero_()
+        self._reward_buf.zero_()
+        self._terminated_buf.fill_(1)
+        self._truncated_buf.fill_(1)
+        self._episode_return_buf.zero_()
+        self._episode_step_buf.zero_()
+        init_last_action = th.zeros(1, self.num_envs, self.action_dim, dtype=self.action_dtype)
 
         obs, info = self.env.reset(seed=seed)
         obs = self._format_obs(obs)
 
         return dict(
             observations=obs,
-            rewards=init_reward,
-            terminateds=init_terminated,
-            truncateds=init_truncated,
-            episode_returns=self.episode_return,
-            episode_steps=self.episode_step,
+            rewards=self._reward_buf,
+            terminateds=self._terminated_buf,
+            truncateds=self._truncated_buf,
+            episode_returns=self._episode_return_buf,
+            episode_steps=self._episode_step_buf,
             last_actions=init_last_action,
         )
 
     def step(self, action: th.Tensor) -> Dict[str, th.Tensor]:
         """Step function that returns a dict consists of the current and history observation and action.
+            The returned tensors are views of internal buffers and remain valid until the next step.
 
         Args:
             action (th.Tensor): Action tensor.
@@ -279,35 +297,36 @@ class DistributedWrapper:
             Step information dict.
         """
         if self.action_type == "Discrete":
-            _action = action.item()
+            _action = action.view(self.num_envs).cpu().numpy()
         elif self.action_type == "Box":
-            _action = action.squeeze(0).cpu().numpy()
+            _action = action.view(self.num_envs, self.action_dim).cpu().numpy()
         else:
             raise NotImplementedError("Unsupported action type!")
 
+        # the sub-environments are reset automatically by the vectorized env
         obs, reward, terminated, truncated, info = self.env.step(_action)
-        self.episode_step += 1
-        self.episode_return += reward
-        episode_step = self.episode_step
-        episode_return = self.episode_return
-        if terminated or truncated:
-            obs, info = self.env.reset()
-            self.episode_return = th.zeros(1, 1)
-            self.episode_step = th.zeros(1, 1, dtype=th.int32)
+        self._reward_buf.copy_(th.from_numpy(reward).view(1, self.num_envs))
+        self._terminated_buf.copy_(th.from_numpy(terminated).view(1, self.num_envs))
+        self._truncated_buf.copy_(th.from_numpy(truncated).view(1, self.num_envs))
 
-        obs = self._format_obs(obs)
-        reward = th.as_tensor(reward, dtype=th.float32).view(1, 1)
-        terminated = th.as_tensor(terminated, dtype=th.uint8).view(1, 1)
-        truncated = th.as_tensor(truncated, dtype=th.uint8).view(1, 1)
+        self.episode_step += 1
+        self.episode_return += self._reward_buf
+        self._episode_step_buf.copy_(self.episode_step)
+        self._episode_return_buf.copy_(self.episode_return)
+        dones = np.logical_or(terminated, truncated)
+        if dones.any():
+            dones_mask = th.from_numpy(dones).view(1, self.num_envs)
+            self.episode_return.masked_fill_(dones_mask, 0.0)
+            self.episode_step.masked_fill_(dones_mask, 0)
 
         return dict(
-            observations=obs,
-            rewards=reward,
-            terminateds=terminated,
-            truncateds=truncated,
-            episode_returns=episode_return,
-            episode_steps=episode_step,
-            last_actions=action,
+            observations=self._format_obs(obs),
+            rewards=self._reward_buf,
+            terminateds=self._terminated_buf,
+            truncateds=self._truncated_buf,
+            episode_returns=self._episode_return_buf,
+            episode_steps=self._episode_step_buf,
+            last_actions=action.view(1, self.num_envs, self.action_dim),
         )
 
     def close(self) -> None:
@@ -315,16 +334,21 @@ class DistributedWrapper:
         self.env.close()
 
     def _format_obs(self, obs: np.ndarray) -> th.Tensor:
-        """Reformat the observation by adding an time dimension.
+        """Reformat the batched observations by adding an time dimension. For envs that write
+            observations into a persistent array (e.g., `SyncVectorEnv` with `copy=False`),
+            the view is built only once.
 
         Args:
-            obs (np.ndarray): Observation.
+            obs (np.ndarray): Batched observations.
 
         Returns:
-            Formatted observation.
+            Formatted observations that share memory with `obs` when it is an array.
         """
-        obs = th.from_numpy(np.array(obs))
-        return obs.view((1, 1, *obs.shape))
+        if obs is not self._obs_array:
+            self._obs_array = obs
+            obs_tensor = th.as_tensor(obs)
+            self._obs_buf = obs_tensor.view((1, *obs_tensor.shape))
+        return self._obs_buf
 
 
 def make_rllte_env(
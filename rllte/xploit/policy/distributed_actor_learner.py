@@ -175,6 +175,9 @@ class DistributedActorLearner(BasePolicy):
         """
         export_model = ExportModel(encoder=self.learner.encoder, actor=self.learner.actor)
         th.save(export_model, path / f"agent_{global_step}.pth")
+        # the distributed agents never pretrain, so the parameters that `load` restores
+        # (e.g., as `init_model_path`) are always saved alongside the exported model
+        th.save(self.learner.state_dict(), path / f"learner_{global_step}.pth")
 
     def load(self, path: str, device: th.device) -> None:
         """Load initial parameters.
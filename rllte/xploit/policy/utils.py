@@ -485,12 +485,7 @@ class DisctributedActorCritic(nn.Module):
         # reshape for policy outputs
         policy_outputs = th.cat(policy_outputs, dim=1).view(T, B, self.policy_reshape_dim)  # type: ignore
         baselines = baselines.view(T, B)
-        if self.action_type == "Discrete":
-            actions = actions.view(T, B, *self.action_shape)
-        elif self.action_type == "Box":
-            actions = actions.view(T, B, *self.action_shape).squeeze(0)  # .clamp(*self.action_range)
-        else:
-            raise NotImplementedError(f"Unsupported action type {self.action_type}!")
+        actions = actions.view(T, B, *self.action_shape)
 
         return dict(policy_outputs=policy_outputs, baselines=baselines, actions=actions)  # type: ignore
 
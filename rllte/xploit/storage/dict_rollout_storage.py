@@ -27,9 +27,9 @@ from typing import Any, Dict, Generator
 
 import gymnasium as gym
 import torch as th
-from torch.utils.data.sampler import BatchSampler, SubsetRandomSampler
 
 from rllte.common.type_alias import DictRolloutBatch
+from rllte.xploit.storage.utils import copy_tensors
 from rllte.xploit.storage.vanilla_rollout_storage import VanillaRolloutStorage
 
 
@@ -92,16 +92,30 @@ class DictRolloutStorage(VanillaRolloutStorage):
         self.terminateds = th.empty(size=(self.storage_size + 1, self.num_envs), dtype=th.float32, device=self.device)
         self.truncateds = th.empty(size=(self.storage_size + 1, self.num_envs), dtype=th.float32, device=self.device)
         # first next_terminated
-        self.terminateds[0].fill_(0.0)
-        self.truncateds[0].fill_(0.0)
+        self.terminateds[0].zero_()
+        self.truncateds[0].zero_()
         # extra part
         self.log_probs = th.empty(size=(self.storage_size, self.num_envs), dtype=th.float32, device=self.device)
         self.values = th.empty(size=(self.storage_size, self.num_envs), dtype=th.float32, device=self.device)
         self.returns = th.empty(size=(self.storage_size, self.num_envs), dtype=th.float32, device=self.device)
         self.advantages = th.empty(size=(self.storage_size, self.num_envs), dtype=th.float32, device=self.device)
+        self._build_flat_views()
 
         super(VanillaRolloutStorage, self).reset()
 
+    def _build_flat_views(self) -> None:
+        """Build the flattened views used for sampling once. The data containers are written in place,
+        so the views stay valid until the next reset.
+        """
+        self._flat_observations = {  # type: ignore[assignment]
+            key: item[:-1].view(-1, *self.obs_shape[key]) for (key, item) in self.observations.items()
+        }
+        self._flat_actions = self.actions.view(-1, *self.action_shape)
+        self._flat_values = self.values.view(-1)
+        self._flat_terminateds = self.terminateds[:-1].view(-1)
+        self._flat_truncateds = self.truncateds[:-1].view(-1)
+        self._flat_log_probs = self.log_probs.view(-1)
+
     def add(
         self,
         observations: Dict[str, th.Tensor],  # type: ignore[override]
@@ -130,6 +144,15 @@ class DictRolloutStorage(VanillaRolloutStorage):
         Returns:
             None.
         """
+        dst = [
+            self.actions[self.step],
+            self.rewards[self.step],
+            self.terminateds[self.step + 1],
+            self.truncateds[self.step + 1],
+            self.log_probs[self.step],
+            self.values[self.step],
+        ]
+        src = [actions.view(self.num_envs, self.action_dim), rewards, terminateds, truncateds, log_probs, values.flatten()]
         for key in self.observations.keys():
             if isinstance(self.observation_space.spaces[key], gym.spaces.Discrete):
                 obs_ = observations[key].reshape((self.num_envs,) + self.obs_shape[key])
@@ -138,15 +161,10 @@ class DictRolloutStorage(VanillaRolloutStorage):
                 obs_ = observations[key]
                 next_obs_ = next_observations[key]
 
-            self.observations[key][self.step].copy_(obs_)
-            self.observations[key][self.step + 1].copy_(next_obs_)
+            dst.extend([self.observations[key][self.step], self.observations[key][self.step + 1]])
+            src.extend([obs_, next_obs_])
 
-        self.actions[self.step].copy_(actions.view(self.num_envs, self.action_dim))
-        self.rewards[self.step].copy_(rewards)
-        self.terminateds[self.step + 1].copy_(terminateds)
-        self.truncateds[self.step + 1].copy_(truncateds)
-        self.log_probs[self.step].copy_(log_probs)
-        self.values[self.step].copy_(values.flatten())
+        copy_tensors(dst, src)
 
         self.full = True if self.step == self.storage_size - 1 else False
         self.step = (self.step + 1) % self.storage_size
@@ -154,17 +172,27 @@ class DictRolloutStorage(VanillaRolloutStorage):
     def sample(self) -> Generator:
         """Sample data from storage."""
         assert self.full, "Cannot sample when the storage is not full!"
-        sampler = BatchSampler(SubsetRandomSampler(range(self.num_envs * self.storage_size)), self.batch_size, drop_last=True)
+        num_samples = self.num_envs * self.storage_size
+        num_batches = num_samples // self.batch_size
+        # one on-device permutation for all the mini-batches, the incomplete batch is dropped
+        sampler = th.randperm(num_samples, device=self.device)[: num_batches * self.batch_size]
+        sampler = sampler.view(num_batches, self.batch_size)
+
+        # flattened views shared by all the mini-batches, returns and advantages are recomputed per rollout
+        observations, actions, values = self._flat_observations, self._flat_actions, self._flat_values
+        terminateds, truncateds, log_probs = self._flat_terminateds, self._flat_truncateds, self._flat_log_probs
+        returns = self.returns.view(-1)
+        advantages = self.advantages.view(-1)
 
         for indices in sampler:
-            batch_obs = {key: item[:-1].view(-1, *self.obs_shape[key])[indices] for (key, item) in self.observations.items()}
-            batch_actions = self.actions.view(-1, *self.action_shape)[indices]
-            batch_values = self.values.view(-1)[indices]
-            batch_returns = self.returns.view(-1)[indices]
-            batch_terminateds = self.terminateds[:-1].view(-1)[indices]
-            batch_truncateds = self.truncateds[:-1].view(-1)[indices]
-            batch_old_log_probs = self.log_probs.view(-1)[indices]
-            adv_targ = self.advantages.view(-1)[indices]
+            batch_obs = {key: item.index_select(0, indices) for (key, item) in observations.items()}
+            batch_actions = actions.index_select(0, indices)
+            batch_values = values.index_select(0, indices)
+            batch_returns = returns.index_select(0, indices)
+            batch_terminateds = terminateds.index_select(0, indices)
+            batch_truncateds = truncateds.index_select(0, indices)
+            batch_old_log_probs = log_probs.index_select(0, indices)
+            adv_targ = advantages.index_select(0, indices)
 
             yield DictRolloutBatch(
                 observations=batch_obs,
@@ -29,7 +29,7 @@ import traceback
 import warnings
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import gymnasium as gym
 import numpy as np
@@ -309,6 +309,9 @@ class NStepReplayStorage(BaseStorage):
             worker_init_fn=worker_init_fn,
         )
         self._replay_iter = None
+        # side stream for prefetching the next batch onto the GPU
+        self._stream = th.cuda.Stream(device=self.device) if self.device.type == "cuda" else None
+        self._next_batch: Optional[Tuple[th.Tensor, ...]] = None
 
     def add(
         self,
@@ -352,17 +355,51 @@ class NStepReplayStorage(BaseStorage):
             self._replay_iter = iter(self.replay_loader)  # type: ignore[assignment]
         return self._replay_iter  # type: ignore[return-value]
 
+    def to_device(self, x: th.Tensor) -> th.Tensor:
+        """Move a collated tensor to the device, asynchronously if it is in pinned memory.
+
+        Args:
+            x (th.Tensor): Tensor collated by the dataloader.
+
+        Returns:
+            Float tensor on the device.
+        """
+        return x.to(self.device, non_blocking=True).float()
+
+    def _preload(self) -> Tuple[th.Tensor, ...]:
+        """Fetch the next batch and issue its copies to the device on the side stream.
+
+        Returns:
+            Batch tensors on the device, which are ready once the side stream is synchronized.
+        """
+        batch = next(self.replay_iter)
+        with th.cuda.stream(self._stream):
+            return tuple(self.to_device(x) for x in batch)
+
     def sample(self) -> NStepReplayBatch:
         """Sample from the storage."""
-        # to device
-        obs, actions, rewards, discounts, next_obs = next(self.replay_iter)
+        if self._stream is None:
+            batch = tuple(self.to_device(x) for x in next(self.replay_iter))
+        else:
+            if self._next_batch is None:
+                self._next_batch = self._preload()
+            # wait for the prefetched copies and hand the memory over to the current stream
+            current_stream = th.cuda.current_stream(self.device)
+            current_stream.wait_stream(self._stream)
+            batch = self._next_batch
+            for x in batch:
+                x.record_stream(current_stream)
+            # overlap the copies of the next batch with the update on this one
+            self._next_batch = self._preload()
+
+        obs, actions, rewards, discounts, next_obs = batch
 
         return NStepReplayBatch(
-            observations=self.to_torch(obs),
-            actions=self.to_torch(actions),
-            rewards=self.to_torch(rewards),
-            discounts=self.to_torch(discounts),
-            next_observations=self.to_torch(next_obs),
+            observations=obs,
+            actions=actions,
+            rewards=rewards,
+            discounts=discounts,
+            next_observations=next_obs,
         )
 
     def update(self, *args) -> None:
@@ -26,7 +26,7 @@
 import io
 import random
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 import numpy as np
 import torch as th
@@ -89,7 +89,9 @@ def worker_init_fn(worker_id: int) -> None:
     Returns:
         None.
     """
-    seed = np.random.get_state()[1][0] + worker_id  # type: ignore
+    # the per-worker torch seed is derived from the main process's generator and the worker id,
+    # so it differs across workers and across re-created worker pools
+    seed = th.initial_seed() % 2**32
     np.random.seed(seed)
     random.seed(seed)
 
@@ -105,3 +107,61 @@ def to_torch(xs: Tuple[np.ndarray, ...], device: th.device) -> Tuple[th.Tensor,
         Tuple[th.Tensor, ...]: Torch tensors.
     """
     return tuple(th.as_tensor(x, device=device).float() for x in xs)
+
+
+@th.jit.script
+def compute_gae(
+    rewards: th.Tensor,
+    values: th.Tensor,
+    last_values: th.Tensor,
+    terminateds: th.Tensor,
+    truncateds: th.Tensor,
+    discount: float,
+    gae_lambda: float,
+) -> th.Tensor:
+    """Generalized advantage estimation (GAE) compiled by TorchScript.
+
+    Args:
+        rewards (th.Tensor): Rewards of shape (num_steps, num_envs).
+        values (th.Tensor): Estimated values of shape (num_steps, num_envs).
+        last_values (th.Tensor): Estimated values of the last step of shape (num_envs,).
+        terminateds (th.Tensor): Termination signals of shape (num_steps + 1, num_envs).
+        truncateds (th.Tensor): Truncation signals of shape (num_steps + 1, num_envs).
+        discount (float): The discount factor.
+        gae_lambda (float): Weighting coefficient for generalized advantage estimation (GAE).
+
+    Returns:
+        Advantages of shape (num_steps, num_envs).
+    """
+    advantages = th.empty_like(rewards)
+    gae = th.zeros_like(last_values)
+    next_values = last_values
+    # the masks are built once for all the steps instead of inside the recursion
+    non_terminals = 1.0 - terminateds
+    non_truncateds = 1.0 - truncateds
+    for step in range(rewards.shape[0] - 1, -1, -1):
+        next_non_terminal = non_terminals[step + 1]
+        delta = rewards[step] + discount * next_values * next_non_terminal - values[step]
+        gae = delta + discount * gae_lambda * next_non_terminal * gae
+        # time limit
+        gae = gae * non_truncateds[step + 1]
+        advantages[step] = gae
+        next_values = values[step]
+    return advantages
+
+
+def copy_tensors(dst: List[th.Tensor], src: List[th.Tensor]) -> None:
+    """Copy a list of tensors into another, with one multi-tensor kernel if PyTorch supports it.
+
+    Args:
+        dst (List[th.Tensor]): Destination tensors.
+        src (List[th.Tensor]): Source tensors.
+
+    Returns:
+        None.
+    """
+    if hasattr(th, "_foreach_copy_"):
+        th._foreach_copy_(dst, src)
+    else:
+        for d, s in zip(dst, src):
+            d.copy_(s)
@@ -24,14 +24,14 @@
 
 
 import threading
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import gymnasium as gym
 import torch as th
-from torch import multiprocessing as mp
 
 from rllte.common.preprocessing import is_image_space
 from rllte.common.prototype import BaseStorage
+from rllte.common.utils import StorageSlots
 
 
 class VanillaDistributedStorage(BaseStorage):
@@ -43,8 +43,10 @@ class VanillaDistributedStorage(BaseStorage):
         device (str): Device (cpu, cuda, ...) on which the code should be run.
         storage_size (int): The capacity of the storage. Here it refers to the length of per rollout.
         num_storages (int): The number of shared-memory storages.
-        num_envs (int): The number of parallel environments.
+        num_envs (int): The number of parallel environments driven by each actor.
         batch_size (int): The batch size.
+        max_batch_size (Optional[int]): Maximum number of storages per sample. Full storages that are ready
+            beyond `batch_size` are drained into the same batch up to this limit. Defaults to `batch_size`.
 
     Returns:
         Vanilla distributed storage.
@@ -57,11 +59,15 @@ class VanillaDistributedStorage(BaseStorage):
         device: str = "cpu",
         storage_size: int = 100,
         num_storages: int = 80,
-        num_envs: int = 45,
+        num_envs: int = 1,
         batch_size: int = 32,
+        max_batch_size: Optional[int] = None,
     ) -> None:
         super().__init__(observation_space, action_space, device, storage_size, batch_size, num_envs)
         self.num_storages = num_storages
+        self.max_batch_size = batch_size if max_batch_size is None else max(max_batch_size, batch_size)
+        # per-thread CUDA streams and pinned staging buffers for the host-to-device copies of the learners
+        self._local = threading.local()
         self.reset()
 
     def reset(self) -> None:
@@ -70,23 +76,27 @@ class VanillaDistributedStorage(BaseStorage):
         action_dtype = th.float32 if self.action_type == "Box" else th.int64
         policy_outputs_dim = self.policy_action_dim * 2 if self.action_type == "Box" else self.policy_action_dim
         specs = dict(
-            observations=dict(size=(self.storage_size + 1, *self.obs_shape), dtype=obs_dtype),
-            actions=dict(size=(self.storage_size + 1, self.action_dim), dtype=action_dtype),
-            rewards=dict(size=(self.storage_size + 1,), dtype=th.float32),
-            terminateds=dict(size=(self.storage_size + 1,), dtype=th.bool),
-            truncateds=dict(size=(self.storage_size + 1,), dtype=th.bool),
-            episode_returns=dict(size=(self.storage_size + 1,), dtype=th.float32),
-            episode_steps=dict(size=(self.storage_size + 1,), dtype=th.int32),
-            last_actions=dict(size=(self.storage_size + 1, self.action_dim), dtype=action_dtype),
-            policy_outputs=dict(size=(self.storage_size + 1, policy_outputs_dim), dtype=th.float32),
-            baselines=dict(size=(self.storage_size + 1,), dtype=th.float32),
+            observations=dict(size=(self.storage_size + 1, self.num_envs, *self.obs_shape), dtype=obs_dtype),
+            actions=dict(size=(self.storage_size + 1, self.num_envs, self.action_dim), dtype=action_dtype),
+            rewards=dict(size=(self.storage_size + 1, self.num_envs), dtype=th.float32),
+            terminateds=dict(size=(self.storage_size + 1, self.num_envs), dtype=th.bool),
+            truncateds=dict(size=(self.storage_size + 1, self.num_envs), dtype=th.bool),
+            episode_returns=dict(size=(self.storage_size + 1, self.num_envs), dtype=th.float32),
+            episode_steps=dict(size=(self.storage_size + 1, self.num_envs), dtype=th.int32),
+            last_actions=dict(size=(self.storage_size + 1, self.num_envs, self.action_dim), dtype=action_dtype),
+            policy_outputs=dict(size=(self.storage_size + 1, self.num_envs, policy_outputs_dim), dtype=th.float32),
+            baselines=dict(size=(self.storage_size + 1, self.num_envs), dtype=th.float32),
         )
 
-        # create memory-shared storages
-        self.storages: Dict[str, List[th.Tensor]] = {key: [] for key in specs}
-        for _ in range(self.num_storages):
-            for key in self.storages.keys():
-                self.storages[key].append(th.empty(**specs[key]).share_memory_())  # type: ignore
+        # create memory-shared storages, one contiguous block of `num_storages` slots per key
+        self.storages: Dict[str, th.Tensor] = {
+            key: th.empty((self.num_storages, *spec["size"]), dtype=spec["dtype"]).share_memory_()  # type: ignore
+            for key, spec in specs.items()
+        }
+        # prebuilt per-slot views, so that writing a step needs no nested indexing
+        self._slot_views: List[Dict[str, th.Tensor]] = [
+            {key: storage[idx] for key, storage in self.storages.items()} for idx in range(self.num_storages)
+        ]
 
     def add(
         self,
@@ -106,33 +116,113 @@ class VanillaDistributedStorage(BaseStorage):
         Returns:
             None
         """
-        for key in env_output:
-            self.storages[key][idx][timestep, ...] = env_output[key]
-        for key in actor_output:
-            self.storages[key][idx][timestep, ...] = actor_output[key]
-
-    def sample(
-        self, free_queue: mp.SimpleQueue, full_queue: mp.SimpleQueue, lock=threading.Lock()  # B008
-    ) -> Dict[str, th.Tensor]:
+        views = self._slot_views[idx]
+        # never record the copies in autograd, so that no graph is retained by the shared storages
+        with th.no_grad():
+            for output in (env_output, actor_output):
+                for key, value in output.items():
+                    step = views[key][timestep]
+                    step.copy_(value.detach().view_as(step))
+
+    def sample(self, slots: StorageSlots, lock=threading.Lock()) -> Optional[Dict[str, th.Tensor]]:  # B008
         """Sample transitions from the storage.
 
         Args:
-            free_queue (Queue): Free queue for communication.
-            full_queue (Queue): Full queue for communication.
+            slots (StorageSlots): Shared slot states for communication.
             lock (Lock): Thread lock.
 
         Returns:
-            Batched samples.
+            Batched samples, or `None` if the communication has been stopped.
         """
+        indices: List[int] = []
         with lock:
-            indices = [full_queue.get() for _ in range(self.batch_size)]
-        batch = {key: th.stack([self.storages[key][i] for i in indices], dim=1) for key in self.storages}
+            for _ in range(self.batch_size):
+                idx = slots.get_full()
+                if idx is None:
+                    slots.put_free(indices)
+                    return None
+                indices.append(idx)
+            # drain the storages that are already full into the same batch
+            while len(indices) < self.max_batch_size:
+                idx = slots.try_get_full()
+                if idx is None:
+                    break
+                indices.append(idx)
+        # gather the storages with one `index_select` per key, [batch_size, T+1, num_envs, ...]
+        use_cuda = self.device.type == "cuda"
+        index = th.as_tensor(indices, dtype=th.long)
+        staging = self._get_staging_buffers() if use_cuda else None
+        batch = dict()
+        for key, storage in self.storages.items():
+            if staging is not None:
+                # gather into page-locked memory so that the copy to the GPU is truly asynchronous
+                out = staging[key][: len(indices)]
+            else:
+                out = th.empty((len(indices), *storage.shape[1:]), dtype=storage.dtype)
+            batch[key] = th.index_select(storage, 0, index, out=out)
+
+        # release the slots
+        slots.put_free(indices)
+
+        if not use_cuda:
+            return {key: self._to_time_major(tensor) for key, tensor in batch.items()}
+        return self._to_device(batch)
+
+    def _get_staging_buffers(self) -> Dict[str, th.Tensor]:
+        """Get the pinned staging buffers of the calling learner thread, which hold up to `max_batch_size`
+            storages per key. Wait until the copies of the previous batch out of the buffers have finished.
 
-        # serialize the data
-        for i in indices:
-            free_queue.put(i)
+        Returns:
+            Pinned staging buffers.
+        """
+        staging = getattr(self._local, "staging", None)
+        if staging is None:
+            staging = self._local.staging = {
+                key: th.empty((self.max_batch_size, *storage.shape[1:]), dtype=storage.dtype, pin_memory=True)
+                for key, storage in self.storages.items()
+            }
+        event = getattr(self._local, "copy_event", None)
+        if event is not None:
+            event.synchronize()
+        return staging
+
+    @staticmethod
+    def _to_time_major(x: th.Tensor) -> th.Tensor:
+        """Reshape gathered storages from [batch_size, T+1, num_envs, ...] to [T+1, batch_size * num_envs, ...].
+
+        Args:
+            x (th.Tensor): Gathered storages.
+
+        Returns:
+            Time-major batch.
+        """
+        return x.transpose(0, 1).reshape(x.size(1), -1, *x.shape[3:])
+
+    def _to_device(self, batch: Dict[str, th.Tensor]) -> Dict[str, th.Tensor]:
+        """Copy a pinned batch to the device on a side stream owned by the calling learner thread.
+
+        Args:
+            batch (Dict[str, th.Tensor]): Batched samples in page-locked memory.
 
-        batch = {key: tensor.to(device=self.device, non_blocking=True) for key, tensor in batch.items()}
+        Returns:
+            Batched samples on the device.
+        """
+        stream = getattr(self._local, "stream", None)
+        if stream is None:
+            stream = self._local.stream = th.cuda.Stream(device=self.device)
+        current_stream = th.cuda.current_stream(self.device)
+        with th.cuda.stream(stream):
+            # the layout is changed on the device, after copying the gathered storages as they are
+            batch = {
+                key: self._to_time_major(tensor.to(device=self.device, non_blocking=True)) for key, tensor in batch.items()
+            }
+            # mark the end of the reads from the staging buffers
+            self._local.copy_event = th.cuda.Event()
+            self._local.copy_event.record(stream)
+        # make the learner wait for the copies and keep the memory alive on its stream
+        current_stream.wait_stream(stream)
+        for tensor in batch.values():
+            tensor.record_stream(current_stream)
         return batch
 
     def update(self, *args, **kwargs) -> None:
@@ -23,14 +23,14 @@
 # =============================================================================
 
 
-from typing import Dict, Generator
+from typing import Dict, Generator, Optional
 
 import gymnasium as gym
 import torch as th
-from torch.utils.data.sampler import BatchSampler, SubsetRandomSampler
 
 from rllte.common.prototype import BaseStorage
 from rllte.common.type_alias import VanillaRolloutBatch
+from rllte.xploit.storage.utils import compute_gae, copy_tensors
 
 
 class VanillaRolloutStorage(BaseStorage):
@@ -64,6 +64,8 @@ class VanillaRolloutStorage(BaseStorage):
         super().__init__(observation_space, action_space, device, storage_size, batch_size, num_envs)
         self.discount = discount
         self.gae_lambda = gae_lambda
+        # decay matrix of the vectorized GAE, built on first use
+        self._gae_weights: Optional[th.Tensor] = None
         self.reset()
 
     def reset(self) -> None:
@@ -77,15 +79,27 @@ class VanillaRolloutStorage(BaseStorage):
         self.terminateds = th.empty(size=(self.storage_size + 1, self.num_envs), dtype=th.float32, device=self.device)
         self.truncateds = th.empty(size=(self.storage_size + 1, self.num_envs), dtype=th.float32, device=self.device)
         # first next_terminated
-        self.terminateds[0].fill_(0.0)
-        self.truncateds[0].fill_(0.0)
+        self.terminateds[0].zero_()
+        self.truncateds[0].zero_()
         # extra part
         self.log_probs = th.empty(size=(self.storage_size, self.num_envs), dtype=th.float32, device=self.device)
         self.values = th.empty(size=(self.storage_size, self.num_envs), dtype=th.float32, device=self.device)
         self.returns = th.empty(size=(self.storage_size, self.num_envs), dtype=th.float32, device=self.device)
         self.advantages = th.empty(size=(self.storage_size, self.num_envs), dtype=th.float32, device=self.device)
+        self._build_flat_views()
         super().reset()
 
+    def _build_flat_views(self) -> None:
+        """Build the flattened views used for sampling once. The data containers are written in place,
+        so the views stay valid until the next reset.
+        """
+        self._flat_observations = self.observations[:-1].view(-1, *self.obs_shape)
+        self._flat_actions = self.actions.view(-1, *self.action_shape)
+        self._flat_values = self.values.view(-1)
+        self._flat_terminateds = self.terminateds[:-1].view(-1)
+        self._flat_truncateds = self.truncateds[:-1].view(-1)
+        self._flat_log_probs = self.log_probs.view(-1)
+
     def add(
         self,
         observations: th.Tensor,
@@ -114,14 +128,28 @@ class VanillaRolloutStorage(BaseStorage):
         Returns:
             None.
         """
-        self.observations[self.step].copy_(observations)
-        self.actions[self.step].copy_(actions.view(self.num_envs, self.action_dim))
-        self.rewards[self.step].copy_(rewards)
-        self.terminateds[self.step + 1].copy_(terminateds)
-        self.truncateds[self.step + 1].copy_(truncateds)
-        self.observations[self.step + 1].copy_(next_observations)
-        self.log_probs[self.step].copy_(log_probs)
-        self.values[self.step].copy_(values.flatten())
+        copy_tensors(
+            [
+                self.observations[self.step],
+                self.actions[self.step],
+                self.rewards[self.step],
+                self.terminateds[self.step + 1],
+                self.truncateds[self.step + 1],
+                self.observations[self.step + 1],
+                self.log_probs[self.step],
+                self.values[self.step],
+            ],
+            [
+                observations,
+                actions.view(self.num_envs, self.action_dim),
+                rewards,
+                terminateds,
+                truncateds,
+                next_observations,
+                log_probs,
+                values.flatten(),
+            ],
+        )
 
         self.full = True if self.step == self.storage_size - 1 else False
         self.step = (self.step + 1) % self.storage_size
@@ -140,36 +168,62 @@ class VanillaRolloutStorage(BaseStorage):
         Returns:
             None.
         """
-        gae = 0
-        for step in reversed(range(self.storage_size)):
-            if step == self.storage_size - 1:
-                next_values = last_values[:, 0]
-            else:
-                next_values = self.values[step + 1]
-            next_non_terminal = 1.0 - self.terminateds[step + 1]
-            delta = self.rewards[step] + self.discount * next_values * next_non_terminal - self.values[step]
-            gae = delta + self.discount * self.gae_lambda * next_non_terminal * gae
-            # time limit
-            gae = gae * (1.0 - self.truncateds[step + 1])
-            self.advantages[step] = gae
+        if self.terminateds[1:].any() or self.truncateds[1:].any():
+            self.advantages = compute_gae(
+                self.rewards,
+                self.values,
+                last_values[:, 0],
+                self.terminateds,
+                self.truncateds,
+                self.discount,
+                self.gae_lambda,
+            )
+        else:
+            # no episode ends within the rollout, so GAE reduces to a discounted reverse sum of the TD errors
+            next_values = th.cat([self.values[1:], last_values[:, 0].unsqueeze(0)], dim=0)
+            deltas = self.rewards + self.discount * next_values - self.values
+            self.advantages = self.get_gae_weights() @ deltas
 
         self.returns = self.advantages + self.values
         self.advantages = (self.advantages - self.advantages.mean()) / (self.advantages.std() + 1e-5)
 
+    def get_gae_weights(self) -> th.Tensor:
+        """Get the upper-triangular matrix `W[t, k] = (discount * gae_lambda) ** (k - t)` for `k >= t`.
+
+        Returns:
+            The decay matrix of shape (storage_size, storage_size).
+        """
+        if self._gae_weights is None:
+            steps = th.arange(self.storage_size, dtype=th.float64, device=self.device)
+            exponents = steps.unsqueeze(0) - steps.unsqueeze(1)
+            weights = th.pow(self.discount * self.gae_lambda, exponents.clamp(min=0.0))
+            self._gae_weights = th.triu(weights).float()
+        return self._gae_weights
+
     def sample(self) -> Generator:
         """Sample data from storage."""
         assert self.full, "Cannot sample when the storage is not full!"
-        sampler = BatchSampler(SubsetRandomSampler(range(self.num_envs * self.storage_size)), self.batch_size, drop_last=True)
+        num_samples = self.num_envs * self.storage_size
+        num_batches = num_samples // self.batch_size
+        # one on-device permutation for all the mini-batches, the incomplete batch is dropped
+        sampler = th.randperm(num_samples, device=self.device)[: num_batches * self.batch_size]
+        sampler = sampler.view(num_batches, self.batch_size)
+
+        # flattened views shared by all the mini-batches, returns and advantages are recomputed per rollout
+        observations, actions, values = self._flat_observations, self._flat_actions, self._flat_values
+        terminateds, truncateds, log_probs = self._flat_terminateds, self._flat_truncateds, self._flat_log_probs
+        returns = self.returns.view(-1)
+        advantages = self.advantages.view(-1)
 
         for indices in sampler:
-            batch_obs = self.observations[:-1].view(-1, *self.obs_shape)[indices]
-            batch_actions = self.actions.view(-1, *self.action_shape)[indices]
-            batch_values = self.values.view(-1)[indices]
-            batch_returns = self.returns.view(-1)[indices]
-            batch_terminateds = self.terminateds[:-1].view(-1)[indices]
-            batch_truncateds = self.truncateds[:-1].view(-1)[indices]
-            batch_old_log_probs = self.log_probs.view(-1)[indices]
-            adv_targ = self.advantages.view(-1)[indices]
+            batch_obs = observations.index_select(0, indices)
+            batch_actions = actions.index_select(0, indices)
+            batch_values = values.index_select(0, indices)
+            batch_returns = returns.index_select(0, indices)
+            batch_terminateds = terminateds.index_select(0, indices)
+            batch_truncateds = truncateds.index_select(0, indices)
+            batch_old_log_probs = log_probs.index_select(0, indices)
+            adv_targ = advantages.index_select(0, indices)
 
             yield VanillaRolloutBatch(
                 observations=batch_obs,
@@ -23,16 +23,52 @@
 # =============================================================================
 
 
-from .gaussian_noise import GaussianNoise as GaussianNoise
-from .grayscale import GrayScale as GrayScale
-from .identity import Identity as Identity
-from .random_amplitude_scaling import RandomAmplitudeScaling as RandomAmplitudeScaling
-from .random_colorjitter import RandomColorJitter as RandomColorJitter
-from .random_convolution import RandomConvolution as RandomConvolution
-from .random_crop import RandomCrop as RandomCrop
-from .random_cutout import RandomCutout as RandomCutout
-from .random_cutoutcolor import RandomCutoutColor as RandomCutoutColor
-from .random_flip import RandomFlip as RandomFlip
-from .random_rotate import RandomRotate as RandomRotate
-from .random_shift import RandomShift as RandomShift
-from .random_translate import RandomTranslate as RandomTranslate
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .gaussian_noise import GaussianNoise as GaussianNoise
+    from .grayscale import GrayScale as GrayScale
+    from .identity import Identity as Identity
+    from .random_amplitude_scaling import RandomAmplitudeScaling as RandomAmplitudeScaling
+    from .random_colorjitter import RandomColorJitter as RandomColorJitter
+    from .random_convolution import RandomConvolution as RandomConvolution
+    from .random_crop import RandomCrop as RandomCrop
+    from .random_cutout import RandomCutout as RandomCutout
+    from .random_cutoutcolor import RandomCutoutColor as RandomCutoutColor
+    from .random_flip import RandomFlip as RandomFlip
+    from .random_rotate import RandomRotate as RandomRotate
+    from .random_shift import RandomShift as RandomShift
+    from .random_translate import RandomTranslate as RandomTranslate
+
+# augmentations are imported on first access, so that processes using only one of them
+# (e.g., actor or data loader workers) do not pay for the rest (notably `torchvision`)
+_LAZY_MODULES = {
+    "GaussianNoise": "gaussian_noise",
+    "GrayScale": "grayscale",
+    "Identity": "identity",
+    "RandomAmplitudeScaling": "random_amplitude_scaling",
+    "RandomColorJitter": "random_colorjitter",
+    "RandomConvolution": "random_convolution",
+    "RandomCrop": "random_crop",
+    "RandomCutout": "random_cutout",
+    "RandomCutoutColor": "random_cutoutcolor",
+    "RandomFlip": "random_flip",
+    "RandomRotate": "random_rotate",
+    "RandomShift": "random_shift",
+    "RandomTranslate": "random_translate",
+}
+
+__all__ = list(_LAZY_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_LAZY_MODULES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -23,6 +23,8 @@
 # =============================================================================
 
 
+from typing import Optional
+
 import torch as th
 from torch.nn import functional as F
 
@@ -42,17 +44,34 @@ class RandomShift(BaseAugmentation):
     def __init__(self, pad: int = 4) -> None:
         super().__init__()
         self.pad = pad
+        # sampling grid of the unshifted images, cached across calls
+        self._base_grid: Optional[th.Tensor] = None
+
+    def get_base_grid(self, x: th.Tensor) -> th.Tensor:
+        """Get the base sampling grid of shape (1, h, h, 2) for images like `x`.
+
+        Args:
+            x (th.Tensor): Images of shape (n, c, h, h).
+
+        Returns:
+            Base sampling grid.
+        """
+        h = x.size(2)
+        grid = self._base_grid
+        if grid is None or grid.size(1) != h or grid.device != x.device or grid.dtype != x.dtype:
+            eps = 1.0 / (h + 2 * self.pad)
+            arange = th.linspace(-1.0 + eps, 1.0 - eps, h + 2 * self.pad, device=x.device, dtype=x.dtype)[:h]
+            arange = arange.unsqueeze(0).repeat(h, 1).unsqueeze(2)
+            grid = th.cat([arange, arange.transpose(1, 0)], dim=2).unsqueeze(0)
+            self._base_grid = grid
+        return grid
 
     def forward(self, x: th.Tensor) -> th.Tensor:
         n, c, h, w = x.size()
         assert h == w
         padding = tuple([self.pad] * 4)
+        base_grid = self.get_base_grid(x)
         x = F.pad(x, padding, "replicate")
-        eps = 1.0 / (h + 2 * self.pad)
-        arange = th.linspace(-1.0 + eps, 1.0 - eps, h + 2 * self.pad, device=x.device, dtype=x.dtype)[:h]
-        arange = arange.unsqueeze(0).repeat(h, 1).unsqueeze(2)
-        base_grid = th.cat([arange, arange.transpose(1, 0)], dim=2)
-        base_grid = base_grid.unsqueeze(0).repeat(n, 1, 1, 1)
 
         # TODO: simplify this
         try:
@@ -61,6 +80,7 @@ class RandomShift(BaseAugmentation):
             shift = th.randint(0, 2 * self.pad + 1, size=(n, 1, 1, 2), dtype=x.dtype).to(x.device)  # for npu device
         shift *= 2.0 / (h + 2 * self.pad)
 
+        # broadcast the shared base grid over the batch instead of repeating it
         grid = base_grid + shift
 
         return F.grid_sample(x, grid, padding_mode="zeros", align_corners=False)
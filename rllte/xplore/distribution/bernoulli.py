@@ -23,7 +23,7 @@
 # =============================================================================
 
 
-from typing import TypeVar
+from typing import Optional, TypeVar
 
 import torch as th
 import torch.distributions as pyd
@@ -34,10 +34,19 @@ SelfBernoulli = TypeVar("SelfBernoulli", bound="Bernoulli")
 
 
 class Bernoulli(BaseDistribution):
-    """Bernoulli distribution for sampling actions for 'MultiBinary' tasks."""
+    """Bernoulli distribution for sampling actions for 'MultiBinary' tasks.
 
-    def __init__(self) -> None:
+    Args:
+        validate_args (Optional[bool]): Whether the wrapped torch distributions check their arguments.
+            `None` follows the torch default, `False` skips the checks for speed.
+
+    Returns:
+        Bernoulli distribution instance.
+    """
+
+    def __init__(self, validate_args: Optional[bool] = None) -> None:
         super().__init__()
+        self.validate_args = validate_args
 
     def __call__(self: SelfBernoulli, logits: th.Tensor) -> SelfBernoulli:
         """Create the distribution.
@@ -48,7 +57,7 @@ class Bernoulli(BaseDistribution):
         Returns:
             Bernoulli distribution instance.
         """
-        self.dist = pyd.Bernoulli(logits=logits)
+        self.dist = pyd.Bernoulli(logits=logits, validate_args=self.validate_args)
         return self
 
     @property
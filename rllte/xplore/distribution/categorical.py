@@ -23,7 +23,7 @@
 # =============================================================================
 
 
-from typing import TypeVar
+from typing import Optional, TypeVar
 
 import torch as th
 import torch.distributions as pyd
@@ -34,10 +34,19 @@ SelfCategorical = TypeVar("SelfCategorical", bound="Categorical")
 
 
 class Categorical(BaseDistribution):
-    """Categorical distribution for sampling actions for 'Discrete' tasks."""
+    """Categorical distribution for sampling actions for 'Discrete' tasks.
 
-    def __init__(self) -> None:
+    Args:
+        validate_args (Optional[bool]): Whether the wrapped torch distributions check their arguments.
+            `None` follows the torch default, `False` skips the checks for speed.
+
+    Returns:
+        Categorical distribution instance.
+    """
+
+    def __init__(self, validate_args: Optional[bool] = None) -> None:
         super().__init__()
+        self.validate_args = validate_args
 
     def __call__(self: SelfCategorical, logits: th.Tensor) -> SelfCategorical:
         """Create the distribution.
@@ -48,7 +57,7 @@ class Categorical(BaseDistribution):
         Returns:
             Categorical distribution instance.
         """
-        self.dist = pyd.Categorical(logits=logits)
+        self.dist = pyd.Categorical(logits=logits, validate_args=self.validate_args)
         return self
 
     @property
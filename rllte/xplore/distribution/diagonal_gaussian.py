@@ -23,7 +23,7 @@
 # =============================================================================
 
 
-from typing import TypeVar
+from typing import Optional, TypeVar
 
 import torch as th
 from torch import distributions as pyd
@@ -34,10 +34,19 @@ SelfDiagonalGaussian = TypeVar("SelfDiagonalGaussian", bound="DiagonalGaussian")
 
 
 class DiagonalGaussian(BaseDistribution):
-    """Diagonal Gaussian distribution for 'Box' tasks."""
+    """Diagonal Gaussian distribution for 'Box' tasks.
 
-    def __init__(self) -> None:
+    Args:
+        validate_args (Optional[bool]): Whether the wrapped torch distributions check their arguments.
+            `None` follows the torch default, `False` skips the checks for speed.
+
+    Returns:
+        Diagonal Gaussian distribution instance.
+    """
+
+    def __init__(self, validate_args: Optional[bool] = None) -> None:
         super().__init__()
+        self.validate_args = validate_args
 
     def __call__(self: SelfDiagonalGaussian, mu: th.Tensor, sigma: th.Tensor) -> SelfDiagonalGaussian:
         """Create the distribution.
@@ -51,7 +60,7 @@ class DiagonalGaussian(BaseDistribution):
         """
         self.mu = mu
         self.sigma = sigma
-        self.dist = pyd.Normal(loc=mu, scale=sigma)
+        self.dist = pyd.Normal(loc=mu, scale=sigma, validate_args=self.validate_args)
         return self
 
     def sample(self, sample_shape: th.Size = th.Size()) -> th.Tensor:  # B008
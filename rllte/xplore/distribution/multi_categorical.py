@@ -23,7 +23,7 @@
 # =============================================================================
 
 
-from typing import Tuple, TypeVar
+from typing import Tuple, Optional, TypeVar
 
 import torch as th
 import torch.distributions as pyd
@@ -34,10 +34,19 @@ SelfMutliCategorical = TypeVar("SelfMutliCategorical", bound="MultiCategorical")
 
 
 class MultiCategorical(BaseDistribution):
-    """Multi-categorical distribution for sampling actions for 'MultiDiscrete' tasks."""
+    """Multi-categorical distribution for sampling actions for 'MultiDiscrete' tasks.
 
-    def __init__(self) -> None:
+    Args:
+        validate_args (Optional[bool]): Whether the wrapped torch distributions check their arguments.
+            `None` follows the torch default, `False` skips the checks for speed.
+
+    Returns:
+        Multi-categorical distribution instance.
+    """
+
+    def __init__(self, validate_args: Optional[bool] = None) -> None:
         super().__init__()
+        self.validate_args = validate_args
 
     def __call__(self: SelfMutliCategorical, logits: Tuple[th.Tensor, ...]) -> SelfMutliCategorical:
         """Create the distribution.
@@ -49,7 +58,7 @@ class MultiCategorical(BaseDistribution):
             Multi-categorical distribution instance.
         """
         super().__init__()
-        self.dist = [pyd.Categorical(logits=logits_) for logits_ in logits]
+        self.dist = [pyd.Categorical(logits=logits_, validate_args=self.validate_args) for logits_ in logits]
         return self
 
     @property
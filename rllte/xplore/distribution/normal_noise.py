@@ -42,6 +42,8 @@ class NormalNoise(BaseDistribution):
         low (float): The lower bound of the noise.
         high (float): The upper bound of the noise.
         eps (float): A small value to avoid numerical instability.
+        validate_args (Optional[bool]): Whether the wrapped torch distributions check their arguments.
+            `None` follows the torch default, `False` skips the checks for speed.
 
     Returns:
         Gaussian action noise instance.
@@ -54,6 +56,7 @@ class NormalNoise(BaseDistribution):
         low: float = -1.0,
         high: float = 1.0,
         eps: float = 1e-6,
+        validate_args: Optional[bool] = None,
     ) -> None:
         super().__init__()
 
@@ -62,7 +65,8 @@ class NormalNoise(BaseDistribution):
         self.low = low
         self.high = high
         self.eps = eps
-        self.dist = pyd.Normal(loc=mu, scale=sigma)
+        self.validate_args = validate_args
+        self.dist = pyd.Normal(loc=mu, scale=sigma, validate_args=validate_args)
 
     def __call__(self: SelfNormalNoise, noiseless_action: th.Tensor) -> SelfNormalNoise:
         """Create the action noise.
@@ -93,17 +97,21 @@ class NormalNoise(BaseDistribution):
         Returns:
             A sample_shape shaped sample.
         """
-        noise = th.as_tensor(
-            self.dist.sample(sample_shape=self.noiseless_action.size()),
-            device=self.noiseless_action.device,
-            dtype=self.noiseless_action.dtype,
-        )
+        # draw the noises on the device of the actions instead of copying them from the host
+        noise = self._standard_normal_like(self.noiseless_action)
+        noise.mul_(self._as_action_param(self.sigma)).add_(self._as_action_param(self.mu))
 
         if clip is not None:
             # clip the sampled noises
-            noise = th.clamp(noise, -clip, clip)
+            noise.clamp_(-clip, clip)
         return self._clamp(noise + self.noiseless_action)
 
+    def _as_action_param(self, param: Union[float, th.Tensor]) -> Union[float, th.Tensor]:
+        """Move a tensor parameter of the noise to the device and dtype of the actions."""
+        if isinstance(param, th.Tensor):
+            return param.to(device=self.noiseless_action.device, dtype=self.noiseless_action.dtype)
+        return param
+
     @property
     def mean(self) -> th.Tensor:
         """Returns the mean of the distribution."""
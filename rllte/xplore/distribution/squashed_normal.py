@@ -24,7 +24,7 @@
 
 
 import math
-from typing import TypeVar
+from typing import Optional, TypeVar
 
 import torch as th
 from torch import distributions as pyd
@@ -65,10 +65,19 @@ class TanhTransform(pyd.transforms.Transform):
 
 
 class SquashedNormal(BaseDistribution):
-    """Squashed normal distribution for `Box` tasks."""
+    """Squashed normal distribution for `Box` tasks.
 
-    def __init__(self) -> None:
+    Args:
+        validate_args (Optional[bool]): Whether the wrapped torch distributions check their arguments.
+            `None` follows the torch default, `False` skips the checks for speed.
+
+    Returns:
+        Squashed normal distribution instance.
+    """
+
+    def __init__(self, validate_args: Optional[bool] = None) -> None:
         super().__init__()
+        self.validate_args = validate_args
 
     def __call__(self: SelfSquashedNormal, mu: th.Tensor, sigma: th.Tensor) -> SelfSquashedNormal:
         """Create the distribution.
@@ -83,8 +92,9 @@ class SquashedNormal(BaseDistribution):
         self.mu = mu
         self.sigma = sigma
         self.dist = pyd.TransformedDistribution(
-            base_distribution=pyd.Normal(loc=mu, scale=sigma),
+            base_distribution=pyd.Normal(loc=mu, scale=sigma, validate_args=self.validate_args),
             transforms=[TanhTransform()],
+            validate_args=self.validate_args,
         )
         return self
 
@@ -26,7 +26,6 @@
 from typing import Optional, TypeVar, Union
 
 import torch as th
-from torch.distributions.utils import _standard_normal
 
 from rllte.common.prototype import BaseDistribution
 from rllte.common.utils import schedule
@@ -100,14 +99,12 @@ class TruncatedNormalNoise(BaseDistribution):
         Returns:
             A sample_shape shaped sample.
         """
-        noise = _standard_normal(
-            self.noiseless_action.size(), dtype=self.noiseless_action.dtype, device=self.noiseless_action.device
-        )
+        noise = self._standard_normal_like(self.noiseless_action)
         noise *= self.scale
 
         if clip is not None:
             # clip the sampled noises
-            noise = th.clamp(noise, -clip, clip)
+            noise.clamp_(-clip, clip)
 
         self.step += 1
 
@@ -134,7 +134,7 @@ class E3B(BaseReward):
         # normalize the observations
         obs_tensor = self.normalize(obs_tensor)
         # compute the intrinsic rewards
-        intrinsic_rewards = th.zeros(size=(n_steps, n_envs)).to(self.device)
+        intrinsic_rewards = th.zeros(size=(n_steps, n_envs), device=self.device)
         with th.no_grad():
             for j in range(n_steps):
                 h = self.encoder(obs_tensor[j])
@@ -142,7 +142,7 @@ class ICM(BaseReward):
                 .squeeze(2)
             )
         # compute the intrinsic rewards
-        intrinsic_rewards = th.zeros(size=(n_steps, n_envs)).to(self.device)
+        intrinsic_rewards = th.zeros(size=(n_steps, n_envs), device=self.device)
         with th.no_grad():
             for i in range(self.n_envs):
                 encoded_obs = self.encoder(obs_tensor[:, i])
@@ -151,7 +151,7 @@ class ICM(BaseReward):
                 dist = F.mse_loss(
                     encoded_next_obs, pred_next_obs, reduction="none"
                 ).mean(dim=1)
-                intrinsic_rewards[:, i] = dist.cpu()
+                intrinsic_rewards[:, i] = dist
 
         # update the reward module
         if sync:
@@ -237,12 +237,12 @@ class PseudoCounts(BaseReward):
                     self.rwd_norm.update(th.cat(self.irs_buffer))
                     self.irs_buffer.clear()
                 if self.obs_norm_type == "rms":
-                    self.obs_norm.update(th.cat(self.obs_buffer).cpu())
+                    self.obs_norm.update(th.cat(self.obs_buffer))
                     self.obs_buffer.clear()
             # flush the episodic memory of intrinsic rewards
             self.n_eps = [[] for _ in range(self.n_envs)]
 
-            return (intrinsic_rewards / self.rwd_norm.std) * self.weight
+            return intrinsic_rewards * (self.weight / self.rwd_norm.std)
 
     def update(self, samples: Dict[str, th.Tensor]) -> None:
         """Update the reward module if necessary.
@@ -142,7 +142,7 @@ class RE3(BaseReward):
         # normalize the observations
         obs_tensor = self.normalize(obs_tensor)
         # compute the intrinsic rewards
-        intrinsic_rewards = th.zeros(size=(n_steps, n_envs)).to(self.device)
+        intrinsic_rewards = th.zeros(size=(n_steps, n_envs), device=self.device)
         with th.no_grad():
             for i in range(n_envs):
                 # get the target features
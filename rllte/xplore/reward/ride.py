@@ -225,7 +225,7 @@ class RIDE(BaseReward):
         obs_tensor = self.normalize(obs_tensor)
         next_obs_tensor = self.normalize(next_obs_tensor)
         # compute the intrinsic rewards
-        intrinsic_rewards = th.zeros(size=(n_steps, n_envs)).to(self.device)
+        intrinsic_rewards = th.zeros(size=(n_steps, n_envs), device=self.device)
         with th.no_grad():
             for i in range(self.n_envs):
                 encoded_obs = self.encoder(obs_tensor[:, i])
@@ -234,7 +234,7 @@ class RIDE(BaseReward):
                     dim=1
                 )
 
-                intrinsic_rewards[:, i] = dist.cpu()
+                intrinsic_rewards[:, i] = dist
 
         if sync:
             # get all the n_eps
@@ -270,12 +270,12 @@ class RIDE(BaseReward):
                     self.rwd_norm.update(th.cat(self.irs_buffer))
                     self.irs_buffer.clear()
                 if self.obs_norm_type == "rms":
-                    self.obs_norm.update(th.cat(self.obs_buffer).cpu())
+                    self.obs_norm.update(th.cat(self.obs_buffer))
                     self.obs_buffer.clear()
             # flush the episodic memory of intrinsic rewards
             self.n_eps = [[] for _ in range(self.n_envs)]
 
-            return (intrinsic_rewards / self.rwd_norm.std) * self.weight
+            return intrinsic_rewards * (self.weight / self.rwd_norm.std)
 
     def update(self, samples: Dict[str, th.Tensor]) -> None:
         """Update the reward module if necessary.
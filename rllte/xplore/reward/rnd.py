@@ -119,7 +119,7 @@ class RND(BaseReward):
         # normalize the observations
         next_obs_tensor = self.normalize(next_obs_tensor)
         # compute the intrinsic rewards
-        intrinsic_rewards = th.zeros(size=(n_steps, n_envs)).to(self.device)
+        intrinsic_rewards = th.zeros(size=(n_steps, n_envs), device=self.device)
         with th.no_grad():
             # get source and target features
             src_feats = self.predictor(next_obs_tensor.view(-1, *self.obs_shape))
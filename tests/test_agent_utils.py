@@ -0,0 +1,19 @@
+import torch as th
+
+from rllte.agent.utils import optimizer_kwargs
+
+
+class PlainSGD(th.optim.Optimizer):
+    def __init__(self, params, lr=0.1):
+        super().__init__(params, dict(lr=lr))
+
+
+def test_optimizer_kwargs():
+    assert optimizer_kwargs(th.optim.Adam, lr=1e-3) == dict(lr=1e-3, foreach=True)
+    assert optimizer_kwargs(th.optim.RMSprop, lr=1e-3, eps=1e-5) == dict(lr=1e-3, eps=1e-5, foreach=True)
+    # an explicit choice is kept
+    assert optimizer_kwargs(th.optim.Adam, lr=1e-3, foreach=False) == dict(lr=1e-3, foreach=False)
+    # optimizers without the multi-tensor implementation never receive the flag
+    kwargs = optimizer_kwargs(PlainSGD, lr=1e-3)
+    assert kwargs == dict(lr=1e-3)
+    PlainSGD([th.zeros(1, requires_grad=True)], **kwargs)
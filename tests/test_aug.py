@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 import pytest
 import torch as th
 
@@ -55,3 +58,23 @@ def test_state_augmentation(aug_cls, device):
     aug(obs)
 
     print("State augmentation test passed!")
+
+
+def test_lazy_exports():
+    from rllte.xplore import augmentation
+
+    for name in augmentation.__all__:
+        assert isinstance(getattr(augmentation, name), type)
+        assert name in dir(augmentation)
+    with pytest.raises(AttributeError):
+        getattr(augmentation, "NotAnAugmentation")
+
+
+def test_lazy_import_skips_torchvision():
+    # run in a fresh interpreter, as other tests may already have imported torchvision
+    code = (
+        "import sys\n"
+        "from rllte.xplore.augmentation import RandomShift\n"
+        "assert 'torchvision' not in sys.modules, 'torchvision was imported'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
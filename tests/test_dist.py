@@ -60,3 +60,13 @@ def test_aug(dist_cls, device):
         print(dist.mean)
 
     print("Distribution test passed!")
+
+
+@pytest.mark.parametrize("dist_cls", [DiagonalGaussian, SquashedNormal])
+def test_validate_args(dist_cls):
+    mu, sigma = th.zeros(2, 3), -th.ones(2, 3)
+    # invalid parameters are rejected by default, as with the torch distributions
+    with pytest.raises(ValueError):
+        dist_cls()(mu, sigma)
+    # and accepted without any check once validation is disabled
+    dist_cls(validate_args=False)(mu, sigma)
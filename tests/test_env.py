@@ -1,6 +1,9 @@
+import gymnasium as gym
+import numpy as np
 import pytest
 import torch as th
 
+from rllte.common.prototype import DistributedAgent
 from rllte.env import (
     make_atari_env,
     make_dmc_env,
@@ -48,3 +51,54 @@ def test_discrete_env(env_cls, device):
     env.close()
 
     print("Environment test passed!")
+
+
+class CountingEnv(gym.Env):
+    """Env whose observation is (env id, in-episode step), with a unit reward and a fixed episode length."""
+
+    def __init__(self, env_id: int, episode_length: int) -> None:
+        self.env_id = env_id
+        self.episode_length = episode_length
+        self.observation_space = gym.spaces.Box(low=0.0, high=100.0, shape=(2,), dtype=np.float32)
+        self.action_space = gym.spaces.Discrete(2)
+        self.t = 0
+
+    def _obs(self):
+        return np.array([self.env_id, self.t], dtype=np.float32)
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        self.t = 0
+        return self._obs(), {}
+
+    def step(self, action):
+        self.t += 1
+        return self._obs(), 1.0, self.t == self.episode_length, False, {}
+
+
+def test_distributed_wrapper_multi_env():
+    episode_lengths = [2, 3, 5]
+    num_envs = len(episode_lengths)
+    env = DistributedAgent.make_actor_env([CountingEnv(i, length) for i, length in enumerate(episode_lengths)])
+    env_output = env.reset(seed=0)
+    assert env_output["observations"].shape == (1, num_envs, 2)
+    assert th.equal(env_output["observations"][0, :, 1], th.zeros(num_envs))
+
+    steps = np.zeros(num_envs, dtype=np.int64)
+    for _ in range(12):
+        action = th.zeros(1, num_envs, 1, dtype=th.int64)
+        env_output = env.step(action)
+        assert env_output["last_actions"].shape == (1, num_envs, 1)
+        steps += 1
+        for i, length in enumerate(episode_lengths):
+            done = steps[i] == length
+            # the episode statistics of the finished episode are reported at its last step
+            assert env_output["terminateds"][0, i] == int(done)
+            assert env_output["episode_returns"][0, i] == float(steps[i])
+            assert env_output["episode_steps"][0, i] == steps[i]
+            if done:
+                steps[i] = 0
+        # the observation view follows the autoreset sub-environments instead of going stale
+        expected_obs = th.as_tensor(np.stack([np.arange(num_envs), steps], axis=1), dtype=th.float32)
+        assert th.equal(env_output["observations"][0], expected_obs)
+    env.close()
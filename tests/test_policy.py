@@ -0,0 +1,29 @@
+import gymnasium as gym
+import torch as th
+
+from rllte.xplore.distribution import Categorical
+from rllte.xploit.encoder import IdentityEncoder
+from rllte.xploit.policy import DistributedActorLearner
+
+
+def make_distributed_policy(observation_space, action_space):
+    policy = DistributedActorLearner(observation_space=observation_space, action_space=action_space, feature_dim=4)
+    policy.freeze(encoder=IdentityEncoder(observation_space=observation_space, feature_dim=4), dist=Categorical())
+    return policy
+
+
+def test_distributed_actor_learner_save_load(tmp_path):
+    observation_space = gym.spaces.Box(low=-1.0, high=1.0, shape=(4,))
+    action_space = gym.spaces.Discrete(3)
+    policy = make_distributed_policy(observation_space, action_space)
+    policy.save(path=tmp_path, pretraining=False, global_step=7)
+    # the deployable model and the restorable parameters are both written
+    assert (tmp_path / "agent_7.pth").exists()
+
+    restored = make_distributed_policy(observation_space, action_space)
+    restored.load(str(tmp_path / "learner_7.pth"), th.device("cpu"))
+    for module in ["learner", "actor"]:
+        expected = policy.learner.state_dict()
+        params = getattr(restored, module).state_dict()
+        assert params.keys() == expected.keys()
+        assert all(th.equal(params[key], expected[key]) for key in expected)
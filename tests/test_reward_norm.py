@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+import torch as th
+
+from rllte.common.utils import TorchRunningMeanStd, standardize
+from rllte.env.testing import make_box_env
+from rllte.xplore.reward import RND
+
+
+def test_running_mean_std():
+    rms = TorchRunningMeanStd(shape=(5,))
+    # a batch with 3-D leading dims, a single-sample batch and a regular batch
+    batches = [th.randn(2, 3, 4, 5) * 3.0 + 1.0, th.randn(1, 5), th.randn(7, 5) - 2.0]
+    for batch in batches:
+        rms.update(batch)
+
+    data = np.concatenate([batch.reshape(-1, 5).numpy() for batch in batches], axis=0)
+    assert rms.mean.shape == (5,) and rms.var.shape == (5,)
+    assert np.allclose(rms.mean.numpy(), data.mean(axis=0), atol=1e-4)
+    assert np.allclose(rms.var.numpy(), np.var(data, axis=0), atol=1e-4)
+
+
+def test_running_mean_std_standardize():
+    rms = TorchRunningMeanStd(shape=(3,))
+    rms.sync_to(th.device("cpu"))
+    for _ in range(2):
+        # the cached statistics are refreshed by every update
+        rms.update(th.randn(64, 3) * 0.1 + 0.5)
+        x = th.randn(16, 4, 3)
+        expected = ((x - rms.mean) / th.sqrt(rms.var + 1e-8)).clip(-5.0, 5.0)
+        assert th.allclose(standardize(x, rms.inv_std_dev, rms.bias_dev, 5.0), expected, atol=1e-5)
+    # features with a zero variance stay finite at their mean instead of becoming NaN
+    rms.var.zero_()
+    rms.sync_to(th.device("cpu"))
+    out = standardize(rms.mean.expand(8, 3), rms.inv_std_dev, rms.bias_dev, 5.0)
+    assert th.isfinite(out).all()
+    assert th.allclose(out, th.zeros(8, 3), atol=1e-2)
+
+
+@pytest.mark.skipif(not th.cuda.is_available(), reason="channels-last batches are only used on cuda")
+@pytest.mark.parametrize("obs_norm_type", ["rms", "none"])
+def test_normalize_channels_last(obs_norm_type):
+    num_envs, num_steps = 2, 8
+    env = make_box_env(env_id="PixelObsEnv", num_envs=num_envs, device="cuda", asynchronous=False)
+    irs = RND(env, device="cuda", obs_norm_type=obs_norm_type)
+    obs = th.randint(0, 256, (num_steps, num_envs, *irs.obs_shape), dtype=th.uint8, device="cuda")
+
+    out = irs.normalize(obs)
+    if obs_norm_type == "rms":
+        expected = ((obs.float() - irs.obs_norm.mean) / th.sqrt(irs.obs_norm.var + 1e-8)).clip(-5.0, 5.0)
+    else:
+        expected = obs / 255.0
+    assert out.shape == obs.shape
+    assert th.allclose(out, expected, atol=1e-5)
+    # the flattened batch fed to the encoders is channels-last without another copy
+    assert out.view(-1, *irs.obs_shape).is_contiguous(memory_format=th.channels_last)
+    # the per-step batches of `watch` and the inputs of `update` keep their layout
+    assert irs.normalize(obs[0]).is_contiguous()
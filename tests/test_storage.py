@@ -1,13 +1,20 @@
+import multiprocessing as mp
+import threading
+import time
+
+import gymnasium as gym
 import pytest
 import torch as th
 
-from rllte.env.testing import make_box_env, make_bitflipping_env
+from rllte.common.utils import StorageSlots
+from rllte.env.testing import make_box_env, make_bitflipping_env, make_discrete_env
 from rllte.xploit.storage import (
     DictReplayStorage,
     DictRolloutStorage,
     HerReplayStorage,
     NStepReplayStorage,
     PrioritizedReplayStorage,
+    VanillaDistributedStorage,
     VanillaReplayStorage,
     VanillaRolloutStorage,
 )
@@ -91,3 +98,161 @@ def test_storage(storage_cls, device):
         storage.sample()
 
     print("Storage test passed!")
+
+
+def reference_gae(rewards, values, last_values, terminateds, truncateds, discount, gae_lambda):
+    # the step-by-step GAE recursion that the vectorized paths must reproduce
+    advantages = th.zeros_like(rewards)
+    gae = th.zeros_like(last_values)
+    for step in reversed(range(rewards.size(0))):
+        next_values = last_values if step == rewards.size(0) - 1 else values[step + 1]
+        next_non_terminal = 1.0 - terminateds[step + 1]
+        delta = rewards[step] + discount * next_values * next_non_terminal - values[step]
+        gae = (delta + discount * gae_lambda * next_non_terminal * gae) * (1.0 - truncateds[step + 1])
+        advantages[step] = gae
+    return advantages
+
+
+@pytest.mark.parametrize("with_dones", [False, True])
+def test_rollout_storage_gae(with_dones):
+    num_envs, num_steps = 4, 128
+    storage = VanillaRolloutStorage(
+        observation_space=gym.spaces.Box(low=-1.0, high=1.0, shape=(3,)),
+        action_space=gym.spaces.Box(low=-1.0, high=1.0, shape=(2,)),
+        storage_size=num_steps,
+        num_envs=num_envs,
+        discount=0.99,
+        gae_lambda=0.95,
+    )
+    storage.rewards.copy_(th.randn(num_steps, num_envs))
+    storage.values.copy_(th.randn(num_steps, num_envs))
+    storage.terminateds.zero_()
+    storage.truncateds.zero_()
+    if with_dones:
+        # episode ends in the middle of the rollout take the recursive fallback
+        storage.terminateds[[17, 60, 101], [0, 1, 2]] = 1.0
+        storage.truncateds[[33, 90], [3, 0]] = 1.0
+    last_values = th.randn(num_envs, 1)
+
+    storage.compute_returns_and_advantages(last_values)
+
+    advantages = reference_gae(
+        storage.rewards, storage.values, last_values[:, 0], storage.terminateds, storage.truncateds, 0.99, 0.95
+    )
+    returns = advantages + storage.values
+    advantages = (advantages - advantages.mean()) / (advantages.std() + 1e-5)
+    assert th.allclose(storage.returns, returns, atol=1e-4, rtol=1e-4)
+    assert th.allclose(storage.advantages, advantages, atol=1e-4, rtol=1e-4)
+
+
+def test_storage_slots_claim_order():
+    slots = StorageSlots(mp.get_context(), num_slots=4)
+    # free slots are claimed by index, full slots in the order they were filled
+    assert [slots.get_free() for _ in range(3)] == [0, 1, 2]
+    assert slots.try_get_full() is None
+    for idx in [2, 0, 1]:
+        slots.put_full(idx)
+    assert [slots.get_full() for _ in range(3)] == [2, 0, 1]
+    assert slots.try_get_full() is None
+    assert [slots.states[i] for i in range(4)] == [StorageSlots.IN_USE] * 3 + [StorageSlots.FREE]
+
+
+def test_storage_slots_release():
+    slots = StorageSlots(mp.get_context(), num_slots=3)
+    indices = [slots.get_free() for _ in range(3)]
+    for idx in indices:
+        slots.put_full(idx)
+    claimed = [slots.get_full(), slots.get_full()]
+    slots.put_free(claimed)
+    assert [slots.states[i] for i in range(3)] == [StorageSlots.FREE, StorageSlots.FREE, StorageSlots.FULL]
+    # released slots can be claimed again by the actors
+    assert slots.get_free() == 0
+
+
+def test_storage_slots_stop_unblocks_learner():
+    slots = StorageSlots(mp.get_context(), num_slots=2)
+    results = []
+    learner = threading.Thread(target=lambda: results.append(slots.get_full(timeout=30.0)))
+    learner.start()
+    time.sleep(0.1)
+    slots.stop()
+    learner.join(timeout=5.0)
+    assert not learner.is_alive()
+    assert results == [None]
+    # nothing can be claimed anymore once stopped
+    assert slots.get_free() is None
+
+
+def test_distributed_storage_sample_after_stop():
+    storage = VanillaDistributedStorage(
+        observation_space=gym.spaces.Box(low=-1.0, high=1.0, shape=(3,)),
+        action_space=gym.spaces.Box(low=-1.0, high=1.0, shape=(2,)),
+        storage_size=5,
+        num_storages=4,
+        num_envs=2,
+        batch_size=2,
+    )
+    slots = StorageSlots(mp.get_context(), num_slots=4)
+    slots.put_full(slots.get_free())
+    # the learner gets one of the two storages it needs and waits for the second one
+    results = []
+    learner = threading.Thread(target=lambda: results.append(storage.sample(slots, threading.Lock())))
+    learner.start()
+    time.sleep(0.1)
+    slots.stop()
+    learner.join(timeout=5.0)
+    assert not learner.is_alive()
+    assert results == [None]
+    # the partially claimed batch is released
+    assert [slots.states[i] for i in range(4)] == [StorageSlots.FREE] * 4
+    assert storage.sample(slots, threading.Lock()) is None
+
+
+def test_distributed_storage_sample():
+    storage = VanillaDistributedStorage(
+        observation_space=gym.spaces.Box(low=-1.0, high=1.0, shape=(3,)),
+        action_space=gym.spaces.Box(low=-1.0, high=1.0, shape=(2,)),
+        storage_size=5,
+        num_storages=4,
+        num_envs=2,
+        batch_size=2,
+    )
+    slots = StorageSlots(mp.get_context(), num_slots=4)
+    for value in [1.0, 2.0]:
+        idx = slots.get_free()
+        storage.storages["rewards"][idx].fill_(value)
+        slots.put_full(idx)
+    batch = storage.sample(slots, threading.Lock())
+    # time-major, with the envs of every storage side by side
+    assert batch["rewards"].shape == (6, 4)
+    assert th.equal(batch["rewards"][:, :2], th.ones(6, 2))
+    assert th.equal(batch["rewards"][:, 2:], th.full((6, 2), 2.0))
+    assert [slots.states[i] for i in range(4)] == [StorageSlots.FREE] * 4
+
+
+@pytest.mark.parametrize("max_batch_size", [None, 4])
+def test_impala_max_batch_size(max_batch_size, tmp_path, monkeypatch):
+    from rllte.agent import IMPALA
+
+    # the agent writes its logs into the working directory
+    monkeypatch.chdir(tmp_path)
+    env = make_discrete_env(num_envs=4, asynchronous=False)
+    agent = IMPALA(
+        env=env,
+        num_steps=5,
+        num_actors=2,
+        num_learners=1,
+        num_storages=8,
+        envs_per_actor=2,
+        batch_size=2,
+        max_batch_size=max_batch_size,
+    )
+    expected_storages = 2 if max_batch_size is None else max_batch_size
+    assert agent.storage.max_batch_size == expected_storages
+
+    for _ in range(5):
+        agent.slots.put_full(agent.slots.get_free())
+    batch = agent.storage.sample(agent.slots, threading.Lock())
+    # the storages that are already full beyond `batch_size` are drained into the same batch
+    assert batch["rewards"].shape == (6, expected_storages * 2)
+    assert sum(agent.slots.states[i] == StorageSlots.FULL for i in range(8)) == 5 - expected_storages